@@ -4,12 +4,60 @@ Flask API for generating module summaries from curriculum JSON
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+from functools import partial
+from types import MappingProxyType
+import base64
+import hashlib
+import inspect
 import json
 import os
+import gzip
+import pickle
+import threading
+import time
+import urllib.parse
+
+import codec
+from concepts import extract_concepts
+from curriculum_stream import (StreamError, StreamedModules, iter_module_spans, iter_modules,
+                               iter_object, mapped)
+from module_store import ModuleStore
+from search import SearchDocument, SearchIndex, curriculum_fields, module_fields, tokenize
+from search_store import IndexSource, MappedSearchIndex, update_index
+from snapshot_store import read_snapshot, section, write_snapshot
+from suggest import SuggestIndex, Suggestion, glossary_terms
+from summarizer import summarize
+
+try:
+    import brotli  # Optional: better ratios for the large text responses
+except ImportError:
+    brotli = None
+
+class CodecJSONProvider(JSONProvider):
+    """Route request parsing and jsonify through the shared JSON codec"""
+    
+    def dumps(self, obj, **kwargs):
+        return codec.dumps(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return codec.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Encoded bytes go straight into the body, no str round trip
+        return self._app.response_class(codec.dumps(obj), mimetype='application/json')
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend integration
+app.json = CodecJSONProvider(app)
+# Seconds browsers may cache a CORS preflight result (when the frontend is
+# served from another origin; serve_frontend.py --api avoids CORS entirely)
+CORS_MAX_AGE = int(os.environ.get('CORS_MAX_AGE', 86400))
+
+CORS(app, max_age=CORS_MAX_AGE)  # Enable CORS for frontend integration
 
 # Map subjects to curriculum files
 CURRICULUM_FILES = {
@@ -18,28 +66,1064 @@ CURRICULUM_FILES = {
     'programming_c': 'programming_c_curriculum.json'
 }
 
-CURRICULUM_CACHE = {}
+# Poll interval (seconds) of the background curriculum watcher
+CURRICULUM_POLL_INTERVAL = float(os.environ.get('CURRICULUM_POLL_INTERVAL', '2.0'))
+
+# Immutable view of one loaded curriculum file. Requests fetch the snapshot
+# once and use only that object, so a reload never exposes half-built state.
+CurriculumSnapshot = namedtuple('CurriculumSnapshot', [
+    'subject',
+    'curriculum',      # None for a streamed (large) file, see build_streamed_snapshot
+    'content_hash',    # sha256 of the curriculum file
+    'mtime',           # mtime of the curriculum file when loaded
+    'modules',         # (level, module_id) -> module
+    'modules_by_id',   # module_id -> (level, module)
+    'module_lists',    # level filter (None for all) -> ModuleList
+])
+
+# /api/modules entries in curriculum order, with the position of each
+# (level, module_id) so a cursor can be resumed after a reload
+ModuleList = namedtuple('ModuleList', ['entries', 'positions'])
+
+CURRICULUM_CACHE = {}  # subject -> CurriculumSnapshot
+
+# Responses smaller than this (bytes) are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+
+# (gzip level, brotli quality) of precompressed variants. Bodies built once
+# per content version get the best ratio; bodies built for arbitrary
+# ?modules= / ?sections= combinations are compressed on the request path of
+# a cache miss, so they get a cheaper level.
+BEST_COMPRESSION = (9, 11)
+FAST_COMPRESSION = (6, 5)
+
+# Encoded response body, its validators for conditional requests and its
+# precompressed variants (None when below COMPRESS_MIN_SIZE or unavailable)
+CachedBody = namedtuple('CachedBody', ['body', 'etag', 'last_modified', 'gzip', 'br'],
+                        defaults=(None, None))
 
-def load_curriculum(subject='mathematics'):
-    """Load curriculum for specified subject"""
-    if subject in CURRICULUM_CACHE:
-        return CURRICULUM_CACHE[subject]
+# Encoded responses, built once per curriculum version
+SUMMARY_CACHE = {}     # (subject, level, module_id, content_hash) -> CachedBody
+MODULE_LIST_CACHE = {} # (subject, content_hash) -> CachedBody
+
+class ResponseCache:
+    """
+    Byte-bounded LRU of CachedBody values, for responses whose keys come
+    from request parameters and so can't be enumerated up front
     
-    if subject not in CURRICULUM_FILES:
-        return None
+    Sizes are counted with cached_body_size, compressed variants included.
+    """
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()  # key -> (entry, size)
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Cached entry for key, or None"""
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            self._cache.move_to_end(key)
+            return cached[0]
     
-    curriculum_path = os.path.join(os.path.dirname(__file__), '..', CURRICULUM_FILES[subject])
+    def put(self, key, entry):
+        """Store an entry, dropping the least recently used ones when over budget"""
+        size = cached_body_size(entry)
+        with self._lock:
+            if key in self._cache:
+                self._evict(key)
+            # Entries larger than the whole budget are served but not kept
+            if size <= self.max_bytes:
+                self._cache[key] = (entry, size)
+                self._cache_bytes += size
+                while self._cache_bytes > self.max_bytes:
+                    self._evict(next(iter(self._cache)))
+    
+    def _evict(self, key):
+        _, size = self._cache.pop(key)
+        self._cache_bytes -= size
+
+# Level bundles of rich modules, keyed by the exact files they were built from:
+# (subject, level, ((module_id, mtime, size), ...), sections, next_url) -> CachedBody
+BUNDLE_CACHE = ResponseCache(int(os.environ.get('BUNDLE_CACHE_BYTES', 16 * 1024 * 1024)))
+
+# Section subsets of rich modules (?sections=), keyed like BUNDLE_CACHE:
+# (subject, level, module_id, mtime, size, sections) -> CachedBody
+SECTION_CACHE = ResponseCache(int(os.environ.get('SECTION_CACHE_BYTES', 8 * 1024 * 1024)))
+
+# Short names accepted by ?sections= for top-level module keys
+SECTION_ALIASES = {'header': 'module_header', 'summary': 'ai_summary'}
+
+# Summaries precomputed by build_summaries.py, used instead of running
+# format_summary whenever the module they were built from is unchanged
+SUMMARIES_PATH = os.environ.get(
+    'SUMMARIES_PATH', os.path.join(os.path.dirname(__file__), '..', 'curriculum_summaries.json'))
+
+# Bump whenever format_summary's output format changes, so older artifacts
+# are ignored. Changes to the summarizer code itself are caught by
+# summarizer_fingerprint() without a bump.
+SUMMARY_FORMAT_VERSION = 1
+
+# Parsed summaries artifact. source_hashes maps subject -> sha256 of the
+# curriculum file it was built from; summaries maps (subject, level,
+# module_id) -> (module hash, summary).
+SummaryArtifact = namedtuple('SummaryArtifact', ['mtime', 'source_hashes', 'summaries'])
+
+SUMMARY_ARTIFACT = None
+SUMMARIZER_FINGERPRINT = None
+
+# Roadmaps the frontend renders (frontend/{subject}_curriculum.json, the
+# files roadmap.js draws); bundles and next-bundle hints follow their order
+ROADMAP_DIR = os.environ.get('ROADMAP_DIR', os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+
+# Rich modules in roadmap order (see get_roadmap)
+Roadmap = namedtuple('Roadmap', [
+    'index',           # MODULE_STORE index it was built from
+    'sources',         # subject -> mtime of the roadmap file it was built from
+    'levels',          # subject -> levels in roadmap order
+    'orders',          # (subject, level) -> ModuleInfo tuple in roadmap order
+    'positions',       # (subject, level, module_id) -> position in its order
+])
+ROADMAP = None
+
+# Largest number of items accepted by /api/summarize/batch
+MAX_BATCH_SIZE = 100
+
+# Page size of /api/modules when paginating (limit, cursor or level given)
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Curriculum hash characters kept in a pagination cursor
+CURSOR_HASH_CHARS = 12
+
+# Largest number of results returned by /api/search
+MAX_SEARCH_RESULTS = 50
+
+# Curriculum files at least this big (bytes) are never parsed whole: they
+# are indexed one module at a time and modules are read from the file when
+# needed, so memory holds the module list rather than the document
+STREAM_PARSE_MIN_BYTES = int(os.environ.get('STREAM_PARSE_MIN_BYTES', 8 * 1024 * 1024))
+
+# Binary snapshot of the parsed curricula, module index and suggestion
+# index, reused across restarts; an empty value disables it
+CONTENT_SNAPSHOT_PATH = os.environ.get(
+    'CONTENT_SNAPSHOT_PATH', os.path.join(os.path.dirname(__file__), 'cache', 'content.snapshot'))
+
+STORED_SECTIONS = None  # Sections read from the snapshot file, until preload is done
+
+_LOAD_LOCK = threading.Lock()
+_SEARCH_LOCK = threading.Lock()
+
+def get_curriculum_path(subject):
+    """Absolute path of the curriculum file for a subject"""
+    return os.path.join(os.path.dirname(__file__), '..', CURRICULUM_FILES[subject])
+
+def build_snapshot(subject):
+    """
+    Parse a curriculum file and build its lookup indexes
+    
+    The parsed state is taken from the content snapshot instead when it
+    was built from the same file contents.
+    
+    Returns:
+        CurriculumSnapshot, or None if the file is missing or invalid
+    """
+    curriculum_path = get_curriculum_path(subject)
     try:
-        with open(curriculum_path, 'r', encoding='utf-8') as f:
-            curriculum = json.load(f)
-            CURRICULUM_CACHE[subject] = curriculum
-            return curriculum
+        mtime = os.path.getmtime(curriculum_path)
+        if os.path.getsize(curriculum_path) >= STREAM_PARSE_MIN_BYTES:
+            return build_streamed_snapshot(subject, curriculum_path, mtime)
+        with open(curriculum_path, 'rb') as f:
+            raw = f.read()
     except FileNotFoundError:
         print(f"Error: Curriculum file not found: {curriculum_path}")
         return None
-    except json.JSONDecodeError:
+    
+    content_hash = hashlib.sha256(raw).hexdigest()
+    stored = section(get_stored_sections(), f'curriculum:{subject}', content_hash)
+    if stored is not None:
+        return make_snapshot(subject, content_hash, mtime, *stored)
+    
+    try:
+        curriculum = codec.loads(raw)
+    except (codec.JSONDecodeError, UnicodeDecodeError):
         print(f"Error: Invalid JSON in curriculum file: {curriculum_path}")
         return None
+    
+    return make_snapshot(subject, content_hash, mtime, curriculum,
+                         *index_curriculum(subject, curriculum))
+
+def build_streamed_snapshot(subject, curriculum_path, mtime):
+    """
+    Index a large curriculum file without parsing it whole
+    
+    The file is memory-mapped and its modules are parsed one at a time to
+    build the module lists; the snapshot keeps only each module's byte span
+    (see StreamedModules) and has no curriculum document.
+    
+    Returns:
+        CurriculumSnapshot, or None if the file is invalid
+    """
+    with mapped(curriculum_path) as buffer:
+        content_hash = hashlib.sha256(buffer).hexdigest()
+        stored = section(get_stored_sections(), f'curriculum:{subject}', content_hash)
+        if stored is not None:
+            return make_snapshot(subject, content_hash, mtime, *stored)
+        
+        # Each module is dropped once its list entry is taken
+        modules = ((level, codec.loads(bytes(buffer[start:end])), (level, start, end))
+                   for level, start, end in iter_module_spans(buffer))
+        try:
+            modules, modules_by_id, module_lists = index_modules(subject, modules)
+        except (StreamError, codec.JSONDecodeError, UnicodeDecodeError):
+            print(f"Error: Invalid JSON in curriculum file: {curriculum_path}")
+            return None
+    
+    path = os.path.abspath(curriculum_path)
+    return make_snapshot(subject, content_hash, mtime, None,
+                         StreamedModules(path, modules),
+                         StreamedModules(path, {module_id: span for module_id, (_, span)
+                                                in modules_by_id.items()}, by_id=True),
+                         module_lists)
+
+def index_curriculum(subject, curriculum):
+    """
+    Lookup maps of a parsed curriculum
+    
+    Returns:
+        Tuple of plain (picklable) modules, modules_by_id and module_lists
+        dictionaries; module_lists maps a level filter to (entries, positions)
+    """
+    return index_modules(subject, ((level_name, module, module)
+                                   for level_name, level_data in curriculum.get('levels', {}).items()
+                                   for module in level_data.get('modules', [])))
+
+def index_modules(subject, modules):
+    """
+    Lookup maps of a curriculum's modules
+    
+    Args:
+        subject: Subject of the curriculum
+        modules: Iterable of (level, module, value) in document order, where
+            value is what the maps hold for the module (the module itself,
+            or its byte span for a streamed file)
+    
+    Returns:
+        Tuple of modules, modules_by_id and module_lists dictionaries, as
+        for index_curriculum
+    """
+    modules_by_key = {}
+    modules_by_id = {}
+    listings = {None: []}
+    for level_name, module, value in modules:
+        entry = {
+            'module_id': module.get('module_id'),
+            'module_name': module.get('module_name'),
+            'level': level_name,
+            'subject': subject
+        }
+        listings[None].append(entry)
+        listings.setdefault(level_name, []).append(entry)
+        
+        module_id = module.get('module_id')
+        if not module_id:
+            continue
+        modules_by_key[(level_name, module_id)] = value
+        # First occurrence wins so a level-less lookup is deterministic
+        modules_by_id.setdefault(module_id, (level_name, value))
+    
+    module_lists = {}
+    for level_filter, entries in listings.items():
+        positions = {}
+        for position, entry in enumerate(entries):
+            positions.setdefault((entry['level'], entry['module_id']), position)
+        module_lists[level_filter] = (tuple(entries), positions)
+    
+    return modules_by_key, modules_by_id, module_lists
+
+def make_snapshot(subject, content_hash, mtime, curriculum, modules, modules_by_id, module_lists):
+    """Wrap a parsed curriculum and its lookup maps into a read-only CurriculumSnapshot"""
+    return CurriculumSnapshot(
+        subject=subject,
+        curriculum=curriculum,
+        content_hash=content_hash,
+        mtime=mtime,
+        # StreamedModules are read-only already
+        modules=modules if isinstance(modules, StreamedModules) else MappingProxyType(modules),
+        modules_by_id=(modules_by_id if isinstance(modules_by_id, StreamedModules)
+                       else MappingProxyType(modules_by_id)),
+        module_lists=MappingProxyType({
+            level: ModuleList(entries, MappingProxyType(positions))
+            for level, (entries, positions) in module_lists.items()
+        })
+    )
+
+def get_stored_sections():
+    """Sections of the content snapshot file, read on first use"""
+    global STORED_SECTIONS
+    if STORED_SECTIONS is None:
+        STORED_SECTIONS = read_snapshot(CONTENT_SNAPSHOT_PATH) if CONTENT_SNAPSHOT_PATH else {}
+    return STORED_SECTIONS
+
+def content_fingerprint():
+    """Hash of every source of the suggestion index: curricula and modules/"""
+    digest = hashlib.sha256()
+    for subject in CURRICULUM_FILES:
+        snapshot = CURRICULUM_CACHE.get(subject)
+        digest.update(f'{subject}:{snapshot.content_hash if snapshot else None}\n'.encode('utf-8'))
+    for key, info in MODULE_STORE.index.items():
+        digest.update(f'{"/".join(key)}:{info.size}:{info.mtime}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+def save_content_snapshot():
+    """Write the content snapshot if any of its sections is missing or stale"""
+    if not CONTENT_SNAPSHOT_PATH:
+        return
+    
+    sections = {}
+    for subject, snapshot in CURRICULUM_CACHE.items():
+        streamed = snapshot.curriculum is None
+        sections[f'curriculum:{subject}'] = (snapshot.content_hash, (
+            snapshot.curriculum,
+            # Streamed modules are stored as their spans, never parsed here
+            snapshot.modules if streamed else dict(snapshot.modules),
+            snapshot.modules_by_id if streamed else dict(snapshot.modules_by_id),
+            {level: (module_list.entries, dict(module_list.positions))
+             for level, module_list in snapshot.module_lists.items()}
+        ))
+    sections['modules'] = (os.path.abspath(MODULE_STORE.modules_dir), MODULE_STORE.index)
+    if SUGGEST_INDEX is not None:
+        sections['suggest'] = (content_fingerprint(), SUGGEST_INDEX)
+    
+    stored = get_stored_sections()
+    if all(name in stored and stored[name][0] == fingerprint
+           for name, (fingerprint, _) in sections.items()):
+        return
+    try:
+        write_snapshot(CONTENT_SNAPSHOT_PATH, sections)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Error: Could not write content snapshot {CONTENT_SNAPSHOT_PATH}: {str(e)}")
+
+def install_snapshot(snapshot):
+    """Warm the response caches for a snapshot, then publish it"""
+    # Summaries of a streamed curriculum are built on first request instead
+    if snapshot.curriculum is not None:
+        for (level, _), module in snapshot.modules.items():
+            get_summary_body(snapshot, level, module)
+    get_module_list_body(snapshot)
+    
+    # Single dict assignment: readers see either the old or the new snapshot
+    CURRICULUM_CACHE[snapshot.subject] = snapshot
+    
+    for cache in (SUMMARY_CACHE, MODULE_LIST_CACHE):
+        # list() copies the keys in one step, while request threads may be
+        # adding entries; iterating the dict itself could fail midway
+        for key in list(cache):
+            if key[0] == snapshot.subject and key[-1] != snapshot.content_hash:
+                cache.pop(key, None)
+
+def get_snapshot(subject='mathematics'):
+    """Current snapshot for a subject, loading it on first use"""
+    snapshot = CURRICULUM_CACHE.get(subject)
+    if snapshot is not None or subject not in CURRICULUM_FILES:
+        return snapshot
+    
+    with _LOAD_LOCK:
+        snapshot = CURRICULUM_CACHE.get(subject)
+        if snapshot is None:
+            snapshot = build_snapshot(subject)
+            if snapshot is not None:
+                install_snapshot(snapshot)
+    return snapshot
+
+def refresh_curricula():
+    """
+    Reload every curriculum whose file changed since its snapshot was built
+    
+    Returns:
+        True if any subject got a new snapshot
+    """
+    changed = False
+    for subject in CURRICULUM_FILES:
+        current = CURRICULUM_CACHE.get(subject)
+        try:
+            mtime = os.path.getmtime(get_curriculum_path(subject))
+        except OSError:
+            continue
+        if current is not None and current.mtime == mtime:
+            continue
+        
+        with _LOAD_LOCK:
+            snapshot = build_snapshot(subject)
+            if snapshot is None:
+                continue  # Keep serving the last good snapshot
+            if current is not None and snapshot.content_hash == current.content_hash:
+                snapshot = current._replace(mtime=snapshot.mtime)
+                CURRICULUM_CACHE[subject] = snapshot
+                continue
+            install_snapshot(snapshot)
+        changed = True
+        action = 'Reloaded' if current is not None else 'Loaded'
+        print(f"{action} {subject} curriculum ({snapshot.content_hash[:12]})")
+    return changed
+
+def refresh_content():
+    """Reload changed curricula and modules, then rebuild derived indexes"""
+    refresh_summary_artifact()
+    changed = refresh_curricula()
+    changed = MODULE_STORE.refresh() or changed
+    if changed and SEARCH_INDEX is not None:
+        update_search_index()
+    if changed and SUGGEST_INDEX is not None:
+        rebuild_suggest_index()
+
+def preload_curricula():
+    """
+    Load and index every curriculum (and warm its response caches)
+    
+    Returns:
+        List of subjects that could not be loaded
+    """
+    global STORED_SECTIONS
+    stored_modules = section(get_stored_sections(), 'modules', os.path.abspath(MODULE_STORE.modules_dir))
+    if stored_modules is not None:
+        MODULE_STORE.restore(stored_modules)
+    
+    refresh_content()
+    get_search_index()
+    get_suggest_index()
+    
+    save_content_snapshot()
+    STORED_SECTIONS = {}  # Everything still current is in use; release the rest
+    return [subject for subject in CURRICULUM_FILES if subject not in CURRICULUM_CACHE]
+
+def start_curriculum_watcher(interval=CURRICULUM_POLL_INTERVAL):
+    """Start a daemon thread that reloads changed curriculum files"""
+    def watch():
+        while True:
+            time.sleep(interval)
+            try:
+                refresh_content()
+            except Exception as e:
+                print(f"Error reloading curricula: {str(e)}")
+    
+    watcher = threading.Thread(target=watch, name='curriculum-watcher', daemon=True)
+    watcher.start()
+    return watcher
+
+def find_module(snapshot, module_id, level=None):
+    """
+    Look up a module through the snapshot indexes
+    
+    Args:
+        snapshot: CurriculumSnapshot of the subject
+        module_id: Module id within the subject
+        level: Optional level; when omitted the module is resolved by id alone
+        
+    Returns:
+        Tuple of (level, module) or None if the module does not exist
+    """
+    if level:
+        module = snapshot.modules.get((level, module_id))
+        return (level, module) if module is not None else None
+    
+    return snapshot.modules_by_id.get(module_id)
+
+def make_cached_body(payload, content_hash=None, mtime=None):
+    """
+    Encode a response payload and derive its validators
+    
+    The strong ETag combines the curriculum content hash with a digest of
+    the body, so it changes whenever either the source data or the
+    rendered representation does.
+    """
+    return make_cached_bytes(codec.dumps(payload), content_hash, mtime)
+
+def make_cached_bytes(body, content_hash=None, mtime=None, compression=BEST_COMPRESSION):
+    """Like make_cached_body, for a body that is already encoded JSON"""
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    etag = f'{content_hash[:16]}-{digest}' if content_hash else digest
+    last_modified = datetime.fromtimestamp(mtime, timezone.utc) if mtime else None
+    
+    gzip_body = br_body = None
+    if len(body) >= COMPRESS_MIN_SIZE:
+        gzip_level, brotli_quality = compression
+        gzip_body = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        if brotli is not None:
+            br_body = brotli.compress(body, quality=brotli_quality)
+    return CachedBody(body, etag, last_modified, gzip_body, br_body)
+
+def cached_body_size(entry):
+    """Bytes held by a CachedBody, including its compressed variants"""
+    return len(entry.body) + len(entry.gzip or b'') + len(entry.br or b'')
+
+# A rich module ready to send: the whole document as a CachedBody, and each
+# top-level member as encoded '"key":value' bytes, in document order
+ModuleEntry = namedtuple('ModuleEntry', ['document', 'sections'])
+
+def split_sections(raw):
+    """
+    Top-level members of an encoded module document
+    
+    raw is parsed once to validate it, but values are sliced out of it as
+    they are rather than re-encoded.
+    
+    Returns:
+        Dictionary of key -> b'"key":value', empty if raw isn't a valid
+        JSON object
+    """
+    try:
+        if not isinstance(codec.loads(raw), dict):
+            return {}
+        return {key: codec.dumps(key) + b':' + raw[value_start:value_end]
+                for key, value_start, value_end in iter_object(raw, 0)}
+    except (codec.JSONDecodeError, UnicodeDecodeError, StreamError):
+        return {}
+
+def build_module_entry(info, raw):
+    sections = split_sections(raw)
+    if not sections:
+        print(f"Error: Invalid module file: {info.path}")
+    return ModuleEntry(make_cached_bytes(raw, mtime=info.mtime), sections)
+
+def module_entry_size(entry):
+    return cached_body_size(entry.document) + sum(len(member) for member in entry.sections.values())
+
+# Rich module documents from modules/, kept as ready-to-send ModuleEntry
+# values in a byte-bounded LRU
+MODULE_STORE = ModuleStore(
+    build_entry=build_module_entry,
+    entry_size=module_entry_size
+)
+
+# Memory-mapped search index file, shared by all workers
+SEARCH_INDEX_PATH = os.environ.get(
+    'SEARCH_INDEX_PATH', os.path.join(os.path.dirname(__file__), 'cache', 'search_index.bin'))
+
+SEARCH_INDEX = None
+
+def extract_module_entries(info, raw):
+    """Search entries of one modules/ file"""
+    document = codec.loads(raw)
+    title = document.get('module_header', {}).get('module_title') or info.module_id
+    return [(SearchDocument(info.subject, info.level, info.module_id, title, 'modules'),
+             module_fields(document))]
+
+def extract_curriculum_entries(subject, raw):
+    """Search entries of every module in a legacy curriculum file"""
+    if len(raw) >= STREAM_PARSE_MIN_BYTES:
+        modules = iter_modules(raw)  # One module at a time, never the whole tree
+    else:
+        modules = ((level, module)
+                   for level, level_data in codec.loads(raw).get('levels', {}).items()
+                   for module in level_data.get('modules', []))
+    
+    entries = []
+    for level, module in modules:
+        module_id = module.get('module_id')
+        if not module_id:
+            continue
+        entries.append((
+            SearchDocument(subject, level, module_id,
+                           module.get('module_name', module_id), 'curriculum'),
+            curriculum_fields(module)
+        ))
+    return entries
+
+def search_sources():
+    """Files the search index is built from: modules/ plus the curricula"""
+    sources = [
+        IndexSource(f'modules/{info.subject}/{info.level}/{info.module_id}.json', info.path,
+                    partial(extract_module_entries, info))
+        for info in MODULE_STORE.list()
+    ]
+    sources += [
+        IndexSource(filename, get_curriculum_path(subject),
+                    partial(extract_curriculum_entries, subject))
+        for subject, filename in CURRICULUM_FILES.items()
+    ]
+    return sources
+
+def update_search_index():
+    """Re-index changed source files and swap in the updated index"""
+    global SEARCH_INDEX
+    with _SEARCH_LOCK:
+        current = SEARCH_INDEX if isinstance(SEARCH_INDEX, MappedSearchIndex) else None
+        try:
+            index, stats = update_index(SEARCH_INDEX_PATH, search_sources(), current)
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"Error: Could not update search index: {str(e)}")
+            # Keep serving the previous index; without one, an empty index
+            # answers searches until the next successful update
+            if SEARCH_INDEX is None:
+                SEARCH_INDEX = SearchIndex([], {})
+            return SEARCH_INDEX
+        if stats['reindexed'] or stats['removed']:
+            print(f"Search index updated: {stats['reindexed']} file(s) re-indexed, "
+                  f"{stats['reused']} reused, {stats['removed']} removed")
+        SEARCH_INDEX = index
+    return index
+
+def get_search_index():
+    """Current search index, opened (or built) on first use"""
+    index = SEARCH_INDEX
+    if index is None:
+        index = update_search_index()
+    return index
+
+SUGGEST_INDEX = None
+
+def build_suggest_index():
+    """Build a SuggestIndex over module names, concepts and glossary terms"""
+    entries = []
+    
+    # Rich modules first: they win over legacy entries with the same text
+    for position, info in enumerate(MODULE_STORE.list()):
+        # Read directly rather than through the LRU so indexing doesn't evict hot modules
+        try:
+            with open(info.path, 'rb') as f:
+                document = codec.loads(f.read())
+        except (OSError, codec.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if not isinstance(document, dict):
+            continue
+        key = (info.subject, info.level, info.module_id)
+        entries.append((Suggestion(info.title or info.module_id, 'module', *key), position))
+        concepts = document.get('concept_overview')
+        for concept in concepts if isinstance(concepts, list) else []:
+            if isinstance(concept, str):
+                entries.append((Suggestion(concept, 'concept', *key), position))
+        for term in glossary_terms(document.get('glossary')):
+            entries.append((Suggestion(term, 'glossary', *key), position))
+    
+    for subject in CURRICULUM_FILES:
+        snapshot = get_snapshot(subject)
+        if not snapshot:
+            continue
+        for position, ((level, module_id), module) in enumerate(snapshot.modules.items()):
+            entries.append((Suggestion(module.get('module_name', module_id), 'module',
+                                       subject, level, module_id), position))
+            concepts = module.get('content_cards', {}).get('concept_overview', {}).get('points', [])
+            for concept in concepts:
+                entries.append((Suggestion(concept, 'concept', subject, level, module_id), position))
+            for term in glossary_terms(module.get('glossary')):
+                entries.append((Suggestion(term, 'glossary', subject, level, module_id), position))
+    
+    return SuggestIndex.build(entries)
+
+def rebuild_suggest_index():
+    """Build a fresh suggestion index and swap it in"""
+    global SUGGEST_INDEX
+    with _SEARCH_LOCK:
+        SUGGEST_INDEX = build_suggest_index()
+    return SUGGEST_INDEX
+
+def get_suggest_index():
+    """Current suggestion index, taken from the content snapshot or built on first use"""
+    global SUGGEST_INDEX
+    index = SUGGEST_INDEX
+    if index is None:
+        index = section(get_stored_sections(), 'suggest', content_fingerprint())
+        if index is not None:
+            SUGGEST_INDEX = index
+        else:
+            index = rebuild_suggest_index()
+    return index
+
+def choose_encoding(available):
+    """Pick the best Content-Encoding the client accepts among available ones"""
+    if not available:
+        return None
+    return request.accept_encodings.best_match(available)
+
+def send_cached(entry, status=200):
+    """
+    Build a response from a CachedBody, answering 304 when the client's
+    If-None-Match / If-Modified-Since already match
+    """
+    variants = {'br': entry.br, 'gzip': entry.gzip}
+    encoding = choose_encoding([name for name, data in variants.items() if data])
+    body = variants[encoding] if encoding else entry.body
+    
+    response = app.response_class(body, status=status, mimetype='application/json')
+    if entry.gzip:
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        response.content_encoding = encoding
+    
+    if status == 200 and entry.etag:
+        # Each encoding is a distinct representation and needs its own ETag
+        response.set_etag(f'{entry.etag}-{encoding}' if encoding else entry.etag)
+        if entry.last_modified:
+            response.last_modified = entry.last_modified
+        # Let browsers and proxies store the body but revalidate each use
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+        response.make_conditional(request)
+    return response
+
+def module_content_hash(module):
+    """sha256 of a module's canonical JSON, independent of key order and codec"""
+    canonical = json.dumps(module, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def build_summary_artifact(snapshots):
+    """
+    Precompute the summary of every module of the given snapshots
+    
+    Returns:
+        JSON-serializable artifact in the format read by refresh_summary_artifact
+    """
+    subjects = {}
+    for snapshot in snapshots:
+        levels = {}
+        for (level, module_id), module in snapshot.modules.items():
+            levels.setdefault(level, {})[module_id] = {
+                'hash': module_content_hash(module),
+                'summary': format_summary(module)
+            }
+        subjects[snapshot.subject] = {
+            'content_hash': snapshot.content_hash,
+            'levels': levels
+        }
+    
+    return {
+        'version': SUMMARY_FORMAT_VERSION,
+        'summarizer': summarizer_fingerprint(),
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'subjects': subjects
+    }
+
+def summarizer_fingerprint():
+    """
+    sha256 of the code that produces summaries: summarizer.py, concepts.py,
+    search.py (whose tokenize the summarizer ranks sentences with) and the
+    summary functions of this module
+    
+    An artifact built by different code is ignored, as its summaries may
+    no longer match what format_summary returns.
+    """
+    global SUMMARIZER_FINGERPRINT
+    if SUMMARIZER_FINGERPRINT is None:
+        digest = hashlib.sha256(f'{SUMMARY_FORMAT_VERSION}\n'.encode('utf-8'))
+        for function in (summarize, extract_concepts, tokenize):
+            with open(inspect.getsourcefile(function), 'rb') as f:
+                digest.update(f.read())
+        for function in (format_summary, extract_module_summary, extract_key_concepts):
+            digest.update(inspect.getsource(function).encode('utf-8'))
+        SUMMARIZER_FINGERPRINT = digest.hexdigest()
+    return SUMMARIZER_FINGERPRINT
+
+def refresh_summary_artifact(path=SUMMARIES_PATH):
+    """
+    (Re)load the summaries artifact if it changed since it was last read
+    
+    A missing, unreadable or outdated artifact leaves an empty one in
+    place, so every summary is computed on the fly.
+    
+    Returns:
+        True if the artifact was (re)loaded
+    """
+    global SUMMARY_ARTIFACT
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    if SUMMARY_ARTIFACT is not None and SUMMARY_ARTIFACT.mtime == mtime:
+        return False
+    
+    source_hashes, summaries = {}, {}
+    if mtime is not None:
+        try:
+            with open(path, 'rb') as f:
+                artifact = codec.loads(f.read())
+        except (OSError, codec.JSONDecodeError, UnicodeDecodeError):
+            print(f"Error: Invalid summaries artifact: {path}")
+            artifact = {}
+        
+        if artifact and artifact.get('summarizer') != summarizer_fingerprint():
+            print("Ignoring summaries artifact built by different summarizer code; "
+                  "run build_summaries.py to refresh it")
+        elif artifact.get('version') == SUMMARY_FORMAT_VERSION:
+            for subject, data in artifact.get('subjects', {}).items():
+                source_hashes[subject] = data.get('content_hash')
+                for level, modules in data.get('levels', {}).items():
+                    for module_id, entry in modules.items():
+                        summaries[(subject, level, module_id)] = (entry['hash'], entry['summary'])
+            print(f"Loaded {len(summaries)} precomputed summaries ({artifact.get('generated_at')})")
+        elif artifact:
+            print(f"Ignoring summaries artifact with format version {artifact.get('version')}; "
+                  f"expected {SUMMARY_FORMAT_VERSION}")
+    
+    SUMMARY_ARTIFACT = SummaryArtifact(mtime, source_hashes, summaries)
+    return True
+
+def get_precomputed_summary(snapshot, level, module):
+    """
+    Summary of a module from the artifact, or None if it is missing or stale
+    
+    If the whole curriculum file is unchanged since the build every entry
+    is current. Otherwise each module is checked against its own hash, so
+    an edit to one module only recomputes that module.
+    """
+    if SUMMARY_ARTIFACT is None:
+        refresh_summary_artifact()
+    artifact = SUMMARY_ARTIFACT
+    entry = artifact.summaries.get((snapshot.subject, level, module.get('module_id')))
+    if entry is None:
+        return None
+    
+    module_hash, summary = entry
+    if artifact.source_hashes.get(snapshot.subject) == snapshot.content_hash:
+        return summary
+    return summary if module_content_hash(module) == module_hash else None
+
+def get_summary_body(snapshot, level, module):
+    """
+    Return the cached /api/summarize response for a module
+    
+    The body is built once per curriculum version and reused until the
+    curriculum file changes. The summary itself comes from the precomputed
+    artifact when it is current, and is computed on the fly otherwise.
+    """
+    key = (snapshot.subject, level, module.get('module_id'), snapshot.content_hash)
+    entry = SUMMARY_CACHE.get(key)
+    if entry is None:
+        summary = get_precomputed_summary(snapshot, level, module)
+        if summary is None:
+            summary = format_summary(module)
+        entry = make_cached_body({
+            'success': True,
+            'summary': summary
+        }, snapshot.content_hash, snapshot.mtime)
+        SUMMARY_CACHE[key] = entry
+    return entry
+
+def get_module_list_body(snapshot):
+    """Return the cached /api/modules response for a subject"""
+    key = (snapshot.subject, snapshot.content_hash)
+    entry = MODULE_LIST_CACHE.get(key)
+    if entry is None:
+        modules_list = list(snapshot.module_lists[None].entries)
+        entry = make_cached_body({
+            'success': True,
+            'subject': snapshot.subject,
+            'modules': modules_list,
+            'total': len(modules_list)
+        }, snapshot.content_hash, snapshot.mtime)
+        MODULE_LIST_CACHE[key] = entry
+    return entry
+
+def encode_cursor(level, module_list, position, content_hash):
+    """Opaque cursor for the page of module_list starting at position"""
+    last = module_list.entries[position - 1]
+    state = [level, position, last['level'], last['module_id'], content_hash[:CURSOR_HASH_CHARS]]
+    return base64.urlsafe_b64encode(codec.dumps(state)).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, level, module_list, content_hash):
+    """
+    Start position of the page a cursor points to
+    
+    A cursor issued for an older curriculum version resumes after the
+    last module it returned, wherever that module is now.
+    
+    Returns:
+        Position in module_list, or None if the cursor is invalid
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_level, position, last_level, last_id, cursor_hash = codec.loads(
+            base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        return None
+    if cursor_level != level or not isinstance(position, int) or position < 0:
+        return None
+    if not all(value is None or isinstance(value, str) for value in (last_level, last_id, cursor_hash)):
+        return None
+    
+    if cursor_hash != content_hash[:CURSOR_HASH_CHARS]:
+        previous = module_list.positions.get((last_level, last_id))
+        if previous is not None:
+            position = previous + 1
+    return min(position, len(module_list.entries))
+
+def get_module_page_body(snapshot, level, start, limit):
+    """Return the cached /api/modules page of limit entries starting at start"""
+    key = (snapshot.subject, level, start, limit, snapshot.content_hash)
+    entry = MODULE_LIST_CACHE.get(key)
+    if entry is None:
+        module_list = snapshot.module_lists[level]
+        end = min(start + limit, len(module_list.entries))
+        next_cursor = None
+        if end < len(module_list.entries):
+            next_cursor = encode_cursor(level, module_list, end, snapshot.content_hash)
+        
+        entry = make_cached_body({
+            'success': True,
+            'subject': snapshot.subject,
+            'level': level,
+            'modules': list(module_list.entries[start:end]),
+            'total': len(module_list.entries),
+            'next_cursor': next_cursor
+        }, snapshot.content_hash, snapshot.mtime)
+        MODULE_LIST_CACHE[key] = entry
+    return entry
+
+def get_roadmap_path(subject):
+    """Absolute path of the roadmap file the frontend renders for a subject"""
+    return os.path.join(ROADMAP_DIR, CURRICULUM_FILES[subject])
+
+def read_roadmap_file(subject):
+    """
+    Module ids of a subject's roadmap, as the frontend renders it
+    
+    Returns:
+        Dictionary of level -> module ids, both in roadmap order, or an
+        empty dictionary if the file is missing or invalid
+    """
+    path = get_roadmap_path(subject)
+    try:
+        with open(path, 'rb') as f:
+            roadmap = codec.loads(f.read())
+        return {level: [module['module_id'] for module in data['modules']]
+                for level, data in roadmap['levels'].items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, codec.JSONDecodeError, UnicodeDecodeError, AttributeError, KeyError, TypeError):
+        print(f"Error: Invalid roadmap file: {path}")
+        return {}
+
+def get_roadmap():
+    """
+    Rich modules in roadmap order, rebuilt only when the module index or a
+    roadmap file changed
+    
+    Levels come in roadmap order, then any other levels in path order.
+    Within a level, modules on the roadmap come in roadmap order and the
+    others follow in path order.
+    """
+    global ROADMAP
+    index = MODULE_STORE.index
+    sources = {}
+    for subject in CURRICULUM_FILES:
+        try:
+            sources[subject] = os.path.getmtime(get_roadmap_path(subject))
+        except OSError:
+            sources[subject] = None
+    roadmap = ROADMAP
+    if roadmap is not None and roadmap.index is index and roadmap.sources == sources:
+        return roadmap
+    
+    listed = {subject: read_roadmap_file(subject) for subject in CURRICULUM_FILES}
+    grouped = {}
+    for info in index.values():
+        grouped.setdefault((info.subject, info.level), []).append(info)
+    
+    orders, positions, levels = {}, {}, {}
+    for (subject, level), infos in grouped.items():
+        module_ids = listed.get(subject, {}).get(level, [])
+        ranks = {module_id: rank for rank, module_id in enumerate(module_ids)}
+        order = tuple(sorted(infos, key=lambda info: ranks.get(info.module_id, len(ranks))))
+        orders[(subject, level)] = order
+        for position, info in enumerate(order):
+            positions[(subject, level, info.module_id)] = position
+        levels.setdefault(subject, []).append(level)
+    
+    for subject, names in levels.items():
+        ranks = list(listed.get(subject, {}))
+        levels[subject] = tuple(sorted(names, key=lambda level: ranks.index(level)
+                                       if level in ranks else len(ranks)))
+    
+    ROADMAP = Roadmap(index, sources, levels, orders, positions)
+    return ROADMAP
+
+def api_url(path, **params):
+    """API URL with the given query parameters (None values left out)"""
+    query = '&'.join(f'{name}={urllib.parse.quote(value, safe=",")}'
+                     for name, value in params.items() if value is not None)
+    return f'{path}?{query}' if query else path
+
+def bundle_path(subject, level):
+    return '/api/bundle/' + '/'.join(urllib.parse.quote(part, safe='') for part in (subject, level))
+
+def parse_sections(value):
+    """
+    Module keys named by a ?sections= value, e.g. 'header,theory'
+    
+    Returns:
+        Frozenset of top-level keys, or None if value names none
+    """
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    return frozenset(SECTION_ALIASES.get(name, name) for name in names) or None
+
+def join_sections(entry, sections):
+    """Encoded object of the requested members of a ModuleEntry, in document order"""
+    return b'{' + b','.join(member for key, member in entry.sections.items() if key in sections) + b'}'
+
+def get_sections_body(info, sections):
+    """Return the cached /api/module response holding only some sections of a module"""
+    key = (info.subject, info.level, info.module_id, info.mtime, info.size, sections)
+    entry = SECTION_CACHE.get(key)
+    if entry is None:
+        module_entry = MODULE_STORE.get(info.subject, info.level, info.module_id)
+        if module_entry is None:
+            return None
+        entry = make_cached_bytes(join_sections(module_entry, sections), mtime=info.mtime,
+                                  compression=FAST_COMPRESSION)
+        SECTION_CACHE.put(key, entry)
+    return entry
+
+def get_bundle_body(subject, level, infos, sections=None, next_url=None):
+    """
+    Return the cached /api/bundle response for a list of rich modules
+    
+    The module documents (or the requested sections of each) are copied
+    into the body as they are stored, and index gives each one's byte
+    offset and length in the (uncompressed) body, so a client can slice
+    and parse a single module without parsing the others. next is the URL
+    of the bundle that follows in roadmap order, for the client to prefetch.
+    Modules whose file isn't a valid JSON object are left out, so one bad
+    file doesn't break the whole level.
+    
+    Returns:
+        CachedBody, or None if a module disappeared while building it
+    """
+    key = (subject, level, tuple((info.module_id, info.mtime, info.size) for info in infos), sections,
+           next_url)
+    entry = BUNDLE_CACHE.get(key)
+    if entry is not None:
+        return entry
+    
+    parts = [b'{"success":true,"subject":', codec.dumps(subject),
+             b',"level":', codec.dumps(level), b',"modules":[']
+    size = sum(len(part) for part in parts)
+    index = []
+    for info in infos:
+        module_entry = MODULE_STORE.get(subject, level, info.module_id)
+        if module_entry is None:
+            return None
+        if not module_entry.sections:
+            continue
+        if sections is None:
+            document = module_entry.document.body.strip()
+        else:
+            document = join_sections(module_entry, sections)
+        if index:
+            parts.append(b',')
+            size += 1
+        index.append({'module_id': info.module_id, 'offset': size, 'length': len(document)})
+        parts.append(document)
+        size += len(document)
+    parts.append(b'],"index":' + codec.dumps(index) + b',"total":' + codec.dumps(len(index))
+                 + b',"next":' + codec.dumps(next_url) + b'}')
+    
+    entry = make_cached_bytes(b''.join(parts), mtime=max((info.mtime for info in infos), default=None),
+                              compression=FAST_COMPRESSION)
+    BUNDLE_CACHE.put(key, entry)
+    return entry
 
 def format_summary(module_data):
     """
@@ -69,37 +1153,17 @@ def format_summary(module_data):
     return summary
 
 def extract_module_summary(theory_text):
-    """Extract 2-3 sentence summary from theory text"""
-    if not theory_text:
-        return "No summary available."
-    
-    # Take first 200-300 characters as summary
-    sentences = theory_text.split('. ')
-    summary_sentences = []
-    char_count = 0
-    
-    for sentence in sentences[:3]:
-        if char_count + len(sentence) < 300:
-            summary_sentences.append(sentence)
-            char_count += len(sentence)
-        else:
-            break
+    """Extract a 2-3 sentence summary from theory text"""
+    if isinstance(theory_text, list):
+        theory_text = '\n\n'.join(theory_text)
     
-    return '. '.join(summary_sentences) + '.' if summary_sentences else theory_text[:300] + '...'
+    return summarize(theory_text) or "No summary available."
 
 def extract_key_concepts(theory_text):
-    """Extract key concepts from theory text"""
-    # Simple extraction - look for definitions and key statements
-    concepts = []
-    
-    if 'is a' in theory_text or 'are' in theory_text:
-        sentences = theory_text.split('. ')
-        for sentence in sentences[:10]:  # First 10 sentences likely contain key concepts
-            if any(keyword in sentence.lower() for keyword in ['is a', 'is an', 'are', 'means', 'represents']):
-                if len(sentence) < 200:  # Keep it concise
-                    concepts.append(sentence.strip())
-            if len(concepts) >= 6:  # Limit to 6 key concepts
-                break
+    """Extract key concepts (definition-like sentences) from theory text"""
+    if isinstance(theory_text, list):
+        theory_text = '\n\n'.join(theory_text)
+    concepts = extract_concepts(theory_text or '')
     
     # Fallback: generic concepts
     if not concepts:
@@ -112,16 +1176,58 @@ def extract_key_concepts(theory_text):
     
     return concepts
 
-@app.route('/api/summarize', methods=['POST'])
+def encode_error(message):
+    """Error body in the API's {"success": false, "error": ...} shape"""
+    return CachedBody(codec.dumps({
+        'success': False,
+        'error': message
+    }), None, None)
+
+def resolve_summary(subject, module_id, level=None):
+    """
+    Resolve one summary request to an HTTP status and encoded body
+    
+    Shared by /api/summarize and /api/summarize/batch so both go through the
+    same lookup and summary cache.
+    
+    Returns:
+        Tuple of (status_code, CachedBody)
+    """
+    if not module_id:
+        return 400, encode_error('module_id is required')
+    if not all(isinstance(value, str) for value in (subject, module_id, level or '')):
+        return 400, encode_error('subject, module_id and level must be strings')
+    
+    # Load curriculum for subject
+    snapshot = get_snapshot(subject)
+    if not snapshot:
+        return 500, encode_error(f'Failed to load curriculum for subject: {subject}')
+    
+    # Find the requested module
+    found = find_module(snapshot, module_id, level)
+    if not found:
+        where = f'at {level} level ' if level else ''
+        return 404, encode_error(f'Module {module_id} not found {where}in {subject}')
+    
+    level, module = found
+    
+    # Generate summary (cached per curriculum version)
+    return 200, get_summary_body(snapshot, level, module)
+
+@app.route('/api/summarize', methods=['GET', 'POST'])
 def summarize_module():
     """
     API endpoint to generate module summary
     
+    GET takes the same fields as query parameters
+    (/api/summarize?subject=mathematics&module_id=linear_equations) and
+    supports conditional requests via ETag / Last-Modified.
+    
     Request JSON format:
     {
         "subject": "mathematics",  # or "aiml" or "programming_c"
         "module_id": "linear_equations",
-        "level": "beginner"
+        "level": "beginner"        # optional, resolved from module_id if omitted
     }
     
     Response JSON format:
@@ -131,7 +1237,7 @@ def summarize_module():
     }
     """
     try:
-        data = request.get_json()
+        data = request.args if request.method in ('GET', 'HEAD') else request.get_json()
         
         if not data:
             return jsonify({
@@ -140,48 +1246,75 @@ def summarize_module():
             }), 400
         
         subject = data.get('subject', 'mathematics')  # Default to mathematics
-        module_id = data.get('module_id')
-        level = data.get('level')
+        status, entry = resolve_summary(subject, data.get('module_id'), data.get('level'))
+        return send_cached(entry, status)
+    
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error'
+        }), 500
+
+@app.route('/api/summarize/batch', methods=['POST'])
+def summarize_batch():
+    """
+    API endpoint to generate several module summaries in one round trip
+    
+    Request JSON format:
+    {
+        "subject": "mathematics",  # optional default for items without one
+        "items": [
+            {"subject": "mathematics", "module_id": "linear_equations", "level": "beginner"},
+            ...
+        ]
+    }
+    
+    Response JSON format:
+    {
+        "results": [ ... one /api/summarize body per item, in request order ... ],
+        "success": true,
+        "total": 2
+    }
+    
+    A missing or unknown module only fails its own entry, which then carries
+    "success": false and an "error" message.
+    """
+    try:
+        data = request.get_json(silent=True)
+        items = data.get('items') if isinstance(data, dict) else None
         
-        if not module_id or not level:
+        if not isinstance(items, list) or not items:
             return jsonify({
                 'success': False,
-                'error': 'module_id and level are required'
+                'error': 'items must be a non-empty list'
             }), 400
         
-        # Load curriculum for subject
-        curriculum = load_curriculum(subject)
-        if not curriculum:
-            return jsonify({
-                'success': False,
-                'error': f'Failed to load curriculum for subject: {subject}'
-            }), 500
-        
-        # Find the requested module
-        modules = curriculum.get('levels', {}).get(level, {}).get('modules', [])
-        module = None
-        
-        for m in modules:
-            if m.get('module_id') == module_id:
-                module = m
-                break
-        
-        if not module:
+        if len(items) > MAX_BATCH_SIZE:
             return jsonify({
                 'success': False,
-                'error': f'Module {module_id} not found at {level} level in {subject}'
-            }), 404
+                'error': f'At most {MAX_BATCH_SIZE} items are allowed per batch'
+            }), 400
         
-        # Generate summary
-        summary = format_summary(module)
+        default_subject = data.get('subject', 'mathematics')
+        bodies = []
+        for item in items:
+            if not isinstance(item, dict):
+                bodies.append(encode_error('Each item must be an object').body)
+                continue
+            _, entry = resolve_summary(item.get('subject', default_subject),
+                                       item.get('module_id'), item.get('level'))
+            bodies.append(entry.body)
         
-        return jsonify({
-            'success': True,
-            'summary': summary
-        })
+        # Splice the cached per-item bodies instead of re-encoding them
+        body = b''.join([
+            b'{"results":[', b','.join(bodies),
+            b'],"success":true,"total":', str(len(bodies)).encode('ascii'), b'}'
+        ])
+        return app.response_class(body, mimetype='application/json')
     
     except Exception as e:
-        print(f"Error processing request: {str(e)}")
+        print(f"Error processing batch request: {str(e)}")
         return jsonify({
             'success': False,
             'error': 'Internal server error'
@@ -195,48 +1328,120 @@ def health_check():
         'service': 'module-summarization-api'
     })
 
+@app.after_request
+def compress_response(response):
+    """Compress large uncached JSON responses (e.g. batch summaries) on the fly"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.content_encoding
+            or response.mimetype != 'application/json'):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    available = ['br', 'gzip'] if brotli is not None else ['gzip']
+    encoding = choose_encoding(available)
+    response.vary.add('Accept-Encoding')
+    if not encoding:
+        return response
+    
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=5))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=6))
+    response.content_encoding = encoding
+    return response
+
+SUBJECTS = [
+    {'id': 'mathematics', 'name': 'Mathematics'},
+    {'id': 'aiml', 'name': 'AI & Machine Learning'},
+    {'id': 'programming_c', 'name': 'Programming in C'}
+]
+
+_SUBJECTS_BODY = None
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness check: 200 once every curriculum is loaded, 503 before"""
+    missing = [subject for subject in CURRICULUM_FILES if subject not in CURRICULUM_CACHE]
+    if missing:
+        return jsonify({
+            'status': 'loading',
+            'missing': missing
+        }), 503
+    return jsonify({
+        'status': 'ready',
+        'subjects': list(CURRICULUM_FILES)
+    })
+
 @app.route('/api/subjects', methods=['GET'])
 def list_subjects():
     """List all available subjects"""
-    subjects = [
-        {'id': 'mathematics', 'name': 'Mathematics'},
-        {'id': 'aiml', 'name': 'AI & Machine Learning'},
-        {'id': 'programming_c', 'name': 'Programming in C'}
-    ]
-    return jsonify({
-        'success': True,
-        'subjects': subjects
-    })
+    global _SUBJECTS_BODY
+    if _SUBJECTS_BODY is None:
+        _SUBJECTS_BODY = make_cached_body({
+            'success': True,
+            'subjects': SUBJECTS
+        })
+    return send_cached(_SUBJECTS_BODY)
 
 @app.route('/api/modules', methods=['GET'])
 def list_modules():
-    """List all available modules for a subject"""
+    """
+    List the modules of a subject
+    
+    Without paging parameters every module is returned. With any of them
+    the response is one page plus the total count and a next_cursor.
+    
+    Query parameters:
+        subject  subject to list (default mathematics)
+        level    optional level filter
+        limit    page size (default DEFAULT_PAGE_SIZE, max MAX_PAGE_SIZE)
+        cursor   next_cursor of the previous page
+    """
     subject = request.args.get('subject', 'mathematics')
+    level = request.args.get('level') or None
+    cursor = request.args.get('cursor')
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     
     try:
-        curriculum = load_curriculum(subject)
-        if not curriculum:
+        snapshot = get_snapshot(subject)
+        if not snapshot:
             return jsonify({
                 'success': False,
                 'error': f'Failed to load curriculum for subject: {subject}'
             }), 500
         
-        modules_list = []
-        for level_name, level_data in curriculum.get('levels', {}).items():
-            for module in level_data.get('modules', []):
-                modules_list.append({
-                    'module_id': module.get('module_id'),
-                    'module_name': module.get('module_name'),
-                    'level': level_name,
-                    'subject': subject
-                })
+        if level is None and cursor is None and 'limit' not in request.args:
+            return send_cached(get_module_list_body(snapshot))
         
-        return jsonify({
-            'success': True,
-            'subject': subject,
-            'modules': modules_list,
-            'total': len(modules_list)
-        })
+        module_list = snapshot.module_lists.get(level)
+        if module_list is None:
+            return jsonify({
+                'success': False,
+                'error': f'Level {level} not found in {subject}'
+            }), 404
+        
+        start = 0
+        if cursor:
+            start = decode_cursor(cursor, level, module_list, snapshot.content_hash)
+            if start is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Invalid cursor'
+                }), 400
+        
+        return send_cached(get_module_page_body(snapshot, level, start, limit))
     
     except Exception as e:
         return jsonify({
@@ -244,6 +1449,206 @@ def list_modules():
             'error': str(e)
         }), 500
 
+@app.route('/api/catalog', methods=['GET'])
+def list_catalog():
+    """List the rich modules found under modules/, optionally filtered"""
+    subject = request.args.get('subject')
+    level = request.args.get('level')
+    
+    modules_list = [{
+        'subject': info.subject,
+        'level': info.level,
+        'module_id': info.module_id,
+        'title': info.title,
+        'size': info.size
+    } for info in MODULE_STORE.list(subject, level)]
+    
+    return jsonify({
+        'success': True,
+        'modules': modules_list,
+        'total': len(modules_list)
+    })
+
+@app.route('/api/search', methods=['GET'])
+def search_modules():
+    """
+    Full-text search over module content
+    
+    Query parameters:
+        q        search terms (required)
+        subject  optional subject filter
+        level    optional level filter
+        limit    number of results (default 10, max MAX_SEARCH_RESULTS)
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({
+            'success': False,
+            'error': 'q is required'
+        }), 400
+    
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+    
+    hits = get_search_index().search(query, request.args.get('subject'),
+                                     request.args.get('level'), limit)
+    results = [{
+        'subject': document.subject,
+        'level': document.level,
+        'module_id': document.module_id,
+        'title': document.title,
+        'source': document.source,
+        'score': round(score, 4)
+    } for score, document in hits]
+    
+    return jsonify({
+        'success': True,
+        'query': query,
+        'results': results,
+        'total': len(results)
+    })
+
+@app.route('/api/suggest', methods=['GET'])
+def suggest_modules():
+    """
+    Typeahead suggestions for module names, concepts and glossary terms
+    
+    Query parameters:
+        prefix   text typed so far (required)
+        subject  optional subject filter
+        limit    number of suggestions (default 10, max 20)
+    """
+    prefix = request.args.get('prefix', '')
+    if not prefix.strip():
+        return jsonify({
+            'success': False,
+            'error': 'prefix is required'
+        }), 400
+    
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'limit must be an integer'
+        }), 400
+    
+    suggestions = get_suggest_index().suggest(prefix, limit, request.args.get('subject'))
+    return jsonify({
+        'success': True,
+        'prefix': prefix,
+        'suggestions': [suggestion._asdict() for suggestion in suggestions],
+        'total': len(suggestions)
+    })
+
+@app.route('/api/module/<subject>/<level>/<module_id>', methods=['GET'])
+def get_module(subject, level, module_id):
+    """
+    Serve one rich module document from modules/{subject}/{level}/{module_id}.json
+    
+    Query parameters:
+        sections  optional comma-separated top-level keys to return instead
+                  of the whole document ('header' and 'summary' stand for
+                  module_header and ai_summary); missing ones are left out
+    """
+    info = MODULE_STORE.info(subject, level, module_id)
+    if 'sections' in request.args:
+        sections = parse_sections(request.args['sections'])
+        if sections is None:
+            return jsonify({
+                'success': False,
+                'error': 'sections must name at least one section'
+            }), 400
+        entry = get_sections_body(info, sections) if info is not None else None
+    else:
+        module_entry = MODULE_STORE.get(subject, level, module_id)
+        entry = module_entry.document if module_entry is not None else None
+    if entry is None:
+        return jsonify({
+            'success': False,
+            'error': f'Module {module_id} not found at {level} level in {subject}'
+        }), 404
+    
+    return send_cached(entry)
+
+@app.route('/api/bundle/<subject>/<level>', methods=['GET'])
+def get_bundle(subject, level):
+    """
+    Several rich modules of one level in a single response
+    
+    Query parameters:
+        modules   optional comma-separated module ids (default: the whole
+                  level), returned in roadmap order
+        sections  optional comma-separated sections of each module, as for
+                  /api/module
+    
+    next names what comes after it in roadmap order, requested the same
+    way: the next level's bundle for a whole level, or else the module
+    after the last one returned (null at the end of the roadmap).
+    """
+    roadmap = get_roadmap()
+    order = roadmap.orders.get((subject, level))
+    if not order:
+        return jsonify({
+            'success': False,
+            'error': f'No modules found at {level} level in {subject}'
+        }), 404
+    
+    infos = order
+    requested = request.args.get('modules')
+    if requested is not None:
+        module_ids = {module_id.strip() for module_id in requested.split(',') if module_id.strip()}
+        if not module_ids or len(module_ids) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'modules must list between 1 and {MAX_BATCH_SIZE} module ids'
+            }), 400
+        found = sorted(roadmap.positions[(subject, level, module_id)] for module_id in module_ids
+                       if (subject, level, module_id) in roadmap.positions)
+        infos = [order[position] for position in found]
+        missing = module_ids - {info.module_id for info in infos}
+        if missing:
+            return jsonify({
+                'success': False,
+                'error': f'Modules not found at {level} level in {subject}: {", ".join(sorted(missing))}'
+            }), 404
+    
+    sections = None
+    if 'sections' in request.args:
+        sections = parse_sections(request.args['sections'])
+        if sections is None:
+            return jsonify({
+                'success': False,
+                'error': 'sections must name at least one section'
+            }), 400
+    
+    sections_param = request.args.get('sections')
+    next_url = None
+    if requested is None:
+        levels = roadmap.levels[subject]
+        position = levels.index(level) + 1
+        if position < len(levels):
+            next_url = api_url(bundle_path(subject, levels[position]), sections=sections_param)
+    else:
+        position = roadmap.positions[(subject, level, infos[-1].module_id)] + 1
+        if position < len(order):
+            next_url = api_url(bundle_path(subject, level), modules=order[position].module_id,
+                               sections=sections_param)
+    
+    entry = get_bundle_body(subject, level, infos, sections, next_url)
+    if entry is None:
+        return jsonify({
+            'success': False,
+            'error': 'Modules changed while building the bundle, please retry'
+        }), 503
+    return send_cached(entry)
+
 if __name__ == '__main__':
     print("=" * 60)
     print("Module Summarization API Starting...")
@@ -258,10 +1663,25 @@ if __name__ == '__main__':
         else:
             print(f"✗ WARNING: {subject.upper()} curriculum not found at {filepath}")
     
+    # Load everything up front and pick up regenerated files without a restart.
+    # With the debug reloader only the serving child process needs a watcher.
+    # For production use gunicorn with wsgi.py (see gunicorn.conf.py).
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        preload_curricula()
+        start_curriculum_watcher()
+    
     print("\nAPI Endpoints:")
     print("  POST /api/summarize  - Generate module summary")
+    print("  GET  /api/summarize  - Same, cacheable (query parameters)")
+    print("  POST /api/summarize/batch - Generate several summaries")
     print("  GET  /api/modules    - List all modules")
+    print("  GET  /api/catalog    - List rich modules under modules/")
+    print("  GET  /api/search?q=  - Full-text module search")
+    print("  GET  /api/suggest?prefix= - Typeahead suggestions")
+    print("  GET  /api/module/<subject>/<level>/<id> - Rich module document (?sections=)")
+    print("  GET  /api/bundle/<subject>/<level> - Rich modules of a level, in one response")
     print("  GET  /api/health     - Health check")
+    print("  GET  /api/ready      - Readiness check")
     print("\nStarting server on http://localhost:5000")
     print("=" * 60)
     
@@ -0,0 +1,61 @@
+"""
+Benchmark the JSON codec against the standard library
+
+Times parsing and serializing the real curriculum files and the whole
+modules/ tree with json and with codec (whichever backend it picked).
+
+    cd backend
+    python bench_codec.py [repeats]
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+import codec
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CURRICULUM_FILES = [
+    'mathematics_curriculum.json',
+    'aiml_curriculum.json',
+    'programming_c_curriculum.json'
+]
+
+def best_of(func, repeats):
+    """Fastest wall time of func over repeats runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def bench(label, raws, repeats):
+    docs = [json.loads(raw) for raw in raws]
+    size_kb = sum(len(raw) for raw in raws) / 1024
+    
+    parse_std = best_of(lambda: [json.loads(raw) for raw in raws], repeats)
+    parse_codec = best_of(lambda: [codec.loads(raw) for raw in raws], repeats)
+    dump_std = best_of(lambda: [json.dumps(doc).encode('utf-8') for doc in docs], repeats)
+    dump_codec = best_of(lambda: [codec.dumps(doc) for doc in docs], repeats)
+    
+    print(f"{label:<32}{size_kb:>9.0f} KB"
+          f"  parse {parse_std:7.2f} -> {parse_codec:6.2f} ms ({parse_std / parse_codec:4.1f}x)"
+          f"  dump {dump_std:7.2f} -> {dump_codec:6.2f} ms ({dump_std / dump_codec:4.1f}x)")
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"codec backend: {codec.BACKEND}, best of {repeats}")
+    print("-" * 110)
+    
+    for filename in CURRICULUM_FILES:
+        bench(filename, [read(os.path.join(ROOT, filename))], repeats)
+    
+    module_paths = sorted(glob.glob(os.path.join(ROOT, 'modules', '*', '*', '*.json')))
+    bench(f"modules/ ({len(module_paths)} files)", [read(p) for p in module_paths], repeats)
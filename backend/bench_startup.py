@@ -0,0 +1,52 @@
+"""
+Benchmark cold start with and without the content snapshot
+
+Each run is a fresh interpreter that imports the app and calls
+preload_curricula(), i.e. what a new worker does before serving. The
+three curricula plus modules/ are loaded from JSON in one mode and from
+backend/cache/content.snapshot in the other.
+
+    cd backend
+    python bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_CHILD = '''
+import time
+import app
+start = time.perf_counter()
+app.preload_curricula()
+print(f"PRELOAD {(time.perf_counter() - start) * 1000:.3f}")
+'''
+
+def preload_ms(snapshot_path):
+    """Preload time of one fresh process, in milliseconds"""
+    env = dict(os.environ, CONTENT_SNAPSHOT_PATH=snapshot_path)
+    output = subprocess.run([sys.executable, '-c', _CHILD], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return float(next(line.split()[1] for line in output.splitlines()
+                      if line.startswith('PRELOAD ')))
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'content.snapshot')
+        preload_ms(snapshot_path)  # Write the snapshot (and warm the OS page cache)
+
+        json_times = [preload_ms('') for _ in range(runs)]
+        snapshot_times = [preload_ms(snapshot_path) for _ in range(runs)]
+
+    json_median = statistics.median(json_times)
+    snapshot_median = statistics.median(snapshot_times)
+    print(f"preload_curricula(), median of {runs} fresh processes")
+    print("-" * 60)
+    print(f"from JSON            {json_median:7.1f} ms")
+    print(f"from snapshot        {snapshot_median:7.1f} ms  ({json_median / snapshot_median:.1f}x)")
@@ -0,0 +1,39 @@
+"""
+JSON codec shared by the curriculum loader and the API responses
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both backends produce compact UTF-8 bytes, so callers can put
+the result straight into a response body.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError  # Subclass of json.JSONDecodeError
+
+    def loads(data):
+        """Parse JSON from bytes or str"""
+        return orjson.loads(data)
+
+    def dumps(obj):
+        """Serialize obj to compact UTF-8 JSON bytes"""
+        return orjson.dumps(obj)
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data):
+        """Parse JSON from bytes or str"""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode('utf-8')
+        return json.loads(data)
+
+    def dumps(obj):
+        """Serialize obj to compact UTF-8 JSON bytes"""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,186 @@
+"""
+Key-concept extraction with a single-pass multi-phrase matcher
+
+Definition cue phrases ("is defined as", "refers to", "is a", ...) are
+compiled into one Aho-Corasick automaton over words. Each sentence is
+tokenized once and fed through the automaton once. Every cue occurrence is
+found in that pass, whatever the size of the cue vocabulary. Sentences are
+then ranked by the weight of the cues they contain.
+
+    python concepts.py     # extract concepts for every module under modules/ and time it
+"""
+
+from collections import deque
+import re
+
+from summarizer import SENTENCE_RE
+
+# Definition cue phrase -> weight. Stronger, more explicit cues weigh more.
+DEFAULT_CUES = {
+    'is defined as': 3.0,
+    'are defined as': 3.0,
+    'is the process of': 2.5,
+    'refers to': 2.5,
+    'is called': 2.5,
+    'are called': 2.5,
+    'is known as': 2.5,
+    'are known as': 2.5,
+    'is said to be': 2.0,
+    'stands for': 2.0,
+    'is a measure of': 2.0,
+    'means': 2.0,
+    'denotes': 2.0,
+    'is given by': 1.5,
+    'is equivalent to': 1.5,
+    'corresponds to': 1.5,
+    'consists of': 1.5,
+    'is characterized by': 1.5,
+    'represents': 1.5,
+    'represent': 1.2,
+    'describes': 1.2,
+    'is a': 1.5,
+    'is an': 1.5,
+    'is the': 1.0,
+    'are the': 1.0,
+    'are': 0.5,
+    'is used to': 1.0,
+    'are used to': 1.0,
+    'determines': 0.8,
+    'measures': 0.8,
+    'specifies': 0.8,
+    'allows': 0.5,
+    'enables': 0.5,
+}
+
+# Most concepts returned per module
+MAX_CONCEPTS = 6
+
+# Only sentences within these bounds read well as a concept bullet
+MIN_CONCEPT_CHARS = 20
+MAX_CONCEPT_CHARS = 200
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_LIST_MARKER_RE = re.compile(r'^(?:[-*•]|\d+\.)\s+')
+
+class CueMatcher:
+    """Aho-Corasick automaton whose alphabet is words rather than characters"""
+
+    def __init__(self, cues=None):
+        self.cues = dict(DEFAULT_CUES if cues is None else cues)
+
+        # State 0 is the root; goto[state] maps a word to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # state -> [(cue, length in words), ...]
+
+        for cue in self.cues:
+            words = cue.lower().split()
+            state = 0
+            for word in words:
+                next_state = self.goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][word] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append((cue, len(words)))
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(word, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def scan(self, words):
+        """
+        Find every cue occurrence in a word sequence
+
+        Yields:
+            (index of the cue's first word, cue)
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for i, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for cue, length in output[state]:
+                yield i - length + 1, cue
+
+    def rank_sentences(self, text):
+        """
+        Rank the sentences of text by the definition cues they contain
+
+        Returns:
+            List of (score, sentence), best first; sentences without cues are left out
+        """
+        lowered = text.lower()
+        cue_weights = self.cues
+        ranked = []
+        for sentence_index, match in enumerate(SENTENCE_RE.finditer(text)):
+            # A list item or line after a lead-in ("Where:") reads on its own
+            sentence = _LIST_MARKER_RE.sub('', match.group().rsplit('\n', 1)[-1].strip())
+            if '$$' in sentence or '\\[' in sentence:
+                continue
+            if not MIN_CONCEPT_CHARS <= len(sentence) < MAX_CONCEPT_CHARS:
+                continue
+            # Cues never span sentences, so the automaton restarts per sentence;
+            # each cue counts once per sentence
+            words = _WORD_RE.findall(lowered, match.start(), match.end())
+            cues = {cue for _, cue in self.scan(words)}
+            if cues:
+                ranked.append((sum(cue_weights[cue] for cue in cues), sentence_index, sentence))
+
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [(score, sentence) for score, _, sentence in ranked]
+
+    def extract(self, text, limit=MAX_CONCEPTS):
+        """Top concept sentences of text"""
+        return [sentence for _, sentence in self.rank_sentences(text)[:limit]]
+
+    def extract_many(self, texts, limit=MAX_CONCEPTS):
+        """Concept sentences of several texts, e.g. every module at build time"""
+        return [self.extract(text, limit) for text in texts]
+
+DEFAULT_MATCHER = CueMatcher()
+
+def extract_concepts(text, limit=MAX_CONCEPTS):
+    """Top concept sentences of text using the default cue vocabulary"""
+    return DEFAULT_MATCHER.extract(text, limit)
+
+if __name__ == '__main__':
+    import glob
+    import os
+    import time
+
+    import codec
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modules')
+    paths = sorted(glob.glob(os.path.join(root, '*', '*', '*.json')))
+    texts = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            theory = codec.loads(f.read()).get('theory', '')
+        texts.append('\n\n'.join(theory) if isinstance(theory, list) else theory)
+
+    start = time.perf_counter()
+    results = DEFAULT_MATCHER.extract_many(texts)
+    elapsed = time.perf_counter() - start
+
+    characters = sum(len(text) for text in texts)
+    print(f"Extracted concepts from {len(texts)} modules ({characters // 1024} KB) "
+          f"in {elapsed * 1000:.1f} ms")
+    for path, concepts in list(zip(paths, results))[:2]:
+        print(f"\n{os.path.relpath(path, root)}:")
+        for concept in concepts:
+            print(f"  - {concept}")
@@ -0,0 +1,319 @@
+"""
+Level- and module-scoped reads from large curriculum JSON files
+
+A curriculum file is memory-mapped and scanned for the byte span of the
+value that is actually needed (one levels.<level> subtree, or one module).
+Only that span is parsed. Everything else is skipped by matching its
+brackets and strings, without building objects. Peak memory is therefore
+the largest value parsed, e.g. one module, rather than the whole document.
+The mapped file itself lives in the OS page cache.
+
+StreamedModules indexes a large curriculum this way and keeps only the
+byte span of each module, parsing a module again when it is looked up.
+
+    python curriculum_stream.py     # compare with a full parse on the curricula
+"""
+
+from collections.abc import Mapping
+from contextlib import contextmanager
+import mmap
+import re
+
+import codec
+
+_WHITESPACE_RE = re.compile(rb'[ \t\n\r]*')
+_STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_SCALAR_RE = re.compile(rb'[^,:\[\]{}\s]+')
+# Everything up to the next bracket, with strings matched whole so brackets
+# inside them are never counted
+_UNTIL_BRACKET_RE = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+
+_OPEN = frozenset(b'[{')
+
+class StreamError(ValueError):
+    """The document isn't valid JSON where the scan needed to look"""
+
+def _skip_whitespace(buffer, position):
+    return _WHITESPACE_RE.match(buffer, position).end()
+
+def skip_value(buffer, position):
+    """
+    End of the JSON value starting at position (after whitespace)
+
+    Returns:
+        Tuple of (start, end) byte offsets of the value
+    """
+    start = _skip_whitespace(buffer, position)
+    if start >= len(buffer):
+        raise StreamError(f'Unexpected end of document at {start}')
+    first = buffer[start]
+
+    if first == 0x22:  # '"'
+        match = _STRING_RE.match(buffer, start)
+        if match is None:
+            raise StreamError(f'Unterminated string at {start}')
+        return start, match.end()
+
+    if first in _OPEN:
+        depth = 1
+        position = start + 1
+        size = len(buffer)
+        while True:
+            position = _UNTIL_BRACKET_RE.match(buffer, position).end()
+            if position >= size:
+                raise StreamError(f'Unterminated container at {start}')
+            depth += 1 if buffer[position] in _OPEN else -1
+            position += 1
+            if depth == 0:
+                return start, position
+
+    match = _SCALAR_RE.match(buffer, start)
+    if match is None:
+        raise StreamError(f'Unexpected byte at {start}')
+    return start, match.end()
+
+def _expect(buffer, position, allowed):
+    position = _skip_whitespace(buffer, position)
+    if position >= len(buffer) or buffer[position] not in allowed:
+        raise StreamError(f'Expected one of {bytes(allowed)!r} at {position}')
+    return position, buffer[position]
+
+def iter_object(buffer, start):
+    """
+    Members of the object whose '{' is at start (after whitespace)
+
+    Yields:
+        (key, value_start, value_end); only the keys are decoded
+    """
+    position, _ = _expect(buffer, start, b'{')
+    position += 1
+    if _expect(buffer, position, b'"}')[1] == 0x7d:  # '}'
+        return
+    while True:
+        key_start, key_end = skip_value(buffer, position)
+        key = codec.loads(bytes(buffer[key_start:key_end]))
+        position, _ = _expect(buffer, key_end, b':')
+        value_start, value_end = skip_value(buffer, position + 1)
+        yield key, value_start, value_end
+        position, token = _expect(buffer, value_end, b',}')
+        if token == 0x7d:
+            return
+        position += 1
+
+def iter_array(buffer, start):
+    """
+    Elements of the array whose '[' is at start (after whitespace)
+
+    Yields:
+        (value_start, value_end) of each element
+    """
+    position, _ = _expect(buffer, start, b'[')
+    position += 1
+    if _expect(buffer, position, b'"[]{}-0123456789tfn')[1] == 0x5d:  # ']'
+        return
+    while True:
+        value_start, value_end = skip_value(buffer, position)
+        yield value_start, value_end
+        position, token = _expect(buffer, value_end, b',]')
+        if token == 0x5d:
+            return
+        position += 1
+
+def find_value(buffer, path):
+    """
+    Byte span of the value at path, e.g. ('levels', 'beginner', 'modules', 0)
+
+    Returns:
+        Tuple of (start, end), or None if the path doesn't exist
+    """
+    start = _skip_whitespace(buffer, 0)
+    if start >= len(buffer):
+        raise StreamError('Empty document')
+    end = None
+    for step in path:
+        if isinstance(step, int):
+            if buffer[start] != 0x5b:  # '['
+                return None
+            spans = iter_array(buffer, start)
+            found = next((span for i, span in enumerate(spans) if i == step), None)
+        else:
+            if buffer[start] != 0x7b:  # '{'
+                return None
+            found = next(((value_start, value_end)
+                          for key, value_start, value_end in iter_object(buffer, start)
+                          if key == step), None)
+        if found is None:
+            return None
+        start, end = found
+    return (start, end) if end is not None else skip_value(buffer, start)
+
+def load_value(buffer, path):
+    """Parsed value at path, or None if the path doesn't exist"""
+    span = find_value(buffer, path)
+    return codec.loads(bytes(buffer[span[0]:span[1]])) if span is not None else None
+
+def member_value(buffer, start, key):
+    """Parsed value of one top-level member of the object at start, or None"""
+    for member, value_start, value_end in iter_object(buffer, start):
+        if member == key:
+            return codec.loads(bytes(buffer[value_start:value_end]))
+    return None
+
+@contextmanager
+def mapped(path):
+    """Read-only memory map of a file (empty bytes for an empty file)"""
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            yield b''
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+def iter_module_spans(buffer, level=None):
+    """
+    Byte spans of the modules of a curriculum document
+
+    Yields:
+        (level, start, end) for every module, optionally of one level only
+    """
+    levels = find_value(buffer, ('levels',))
+    if levels is None or buffer[levels[0]] != 0x7b:
+        return
+    for level_name, level_start, _ in iter_object(buffer, levels[0]):
+        if level is not None and level_name != level:
+            continue
+        if buffer[level_start] != 0x7b:
+            continue
+        for key, modules_start, _ in iter_object(buffer, level_start):
+            if key != 'modules' or buffer[modules_start] != 0x5b:
+                continue
+            for module_start, module_end in iter_array(buffer, modules_start):
+                yield level_name, module_start, module_end
+
+def iter_modules(buffer, level=None):
+    """
+    Modules of a curriculum document, parsed one at a time
+
+    Yields:
+        (level, module) for every module, optionally of one level only
+    """
+    for level_name, start, end in iter_module_spans(buffer, level):
+        yield level_name, codec.loads(bytes(buffer[start:end]))
+
+class StreamedModules(Mapping):
+    """
+    Read-only mapping over the modules of a curriculum file that holds only
+    their byte spans
+
+    spans maps each key to (level, start, end). A lookup reads and parses
+    that one module; items() maps the file once and parses the modules one
+    at a time. Keys are (level, module_id) and values modules, or with
+    by_id, keys are module ids and values (level, module) pairs.
+    """
+
+    def __init__(self, path, spans, by_id=False):
+        self.path = path
+        self.spans = spans
+        self.by_id = by_id
+
+    def _value(self, level, module):
+        return (level, module) if self.by_id else module
+
+    def __getitem__(self, key):
+        level, start, end = self.spans[key]
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                module = codec.loads(f.read(end - start))
+        except (OSError, ValueError):
+            raise KeyError(key) from None
+        # A file rewritten since it was indexed (until it is reindexed)
+        module_id = key if self.by_id else key[1]
+        if not isinstance(module, dict) or module.get('module_id') != module_id:
+            raise KeyError(key)
+        return self._value(level, module)
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def items(self):
+        with mapped(self.path) as buffer:
+            for key, (level, start, end) in self.spans.items():
+                yield key, self._value(level, codec.loads(bytes(buffer[start:end])))
+
+def load_level(path, level):
+    """
+    The levels.<level> subtree of a curriculum file
+
+    Raises:
+        OSError: The file can't be read
+        StreamError: The file isn't valid JSON
+
+    Returns:
+        Parsed level dictionary, or None if the level doesn't exist
+    """
+    with mapped(path) as buffer:
+        return load_value(buffer, ('levels', level))
+
+def load_module(path, level, module_id):
+    """
+    One module of a curriculum file; only its module_id is decoded for the
+    modules before it
+
+    Raises:
+        OSError: The file can't be read
+        StreamError: The file isn't valid JSON
+
+    Returns:
+        Parsed module dictionary, or None if it doesn't exist at that level
+    """
+    with mapped(path) as buffer:
+        modules = find_value(buffer, ('levels', level, 'modules'))
+        if modules is None or buffer[modules[0]] != 0x5b:
+            return None
+        for module_start, module_end in iter_array(buffer, modules[0]):
+            if buffer[module_start] != 0x7b:
+                continue
+            if member_value(buffer, module_start, 'module_id') == module_id:
+                return codec.loads(bytes(buffer[module_start:module_end]))
+    return None
+
+if __name__ == '__main__':
+    import os
+    import time
+    import tracemalloc
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for filename in ['mathematics_curriculum.json', 'aiml_curriculum.json',
+                     'programming_c_curriculum.json']:
+        path = os.path.join(root, filename)
+        with open(path, 'rb') as f:
+            curriculum = codec.loads(f.read())
+        level, level_data = list(curriculum['levels'].items())[-1]
+        module_id = level_data['modules'][-1]['module_id']
+
+        def full():
+            with open(path, 'rb') as f:
+                return codec.loads(f.read())['levels'][level]
+
+        results = []
+        for label, load in [('full parse', full),
+                            ('load_level', lambda: load_level(path, level)),
+                            ('load_module', lambda: load_module(path, level, module_id))]:
+            start = time.perf_counter()
+            load()
+            elapsed = time.perf_counter() - start
+            # Peak is measured in a separate run, as tracing slows the scan down
+            tracemalloc.start()
+            load()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append(f"{label} {elapsed * 1000:5.2f} ms / {peak // 1024:4d} KB peak")
+        print(f"{filename:<32}" + '   '.join(results))
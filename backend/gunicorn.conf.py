@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for the production API server
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Tunable through environment variables:
+    API_BIND      address to listen on          (default 0.0.0.0:5000)
+    API_WORKERS   worker processes              (default: one per CPU core)
+    API_THREADS   request threads per worker    (default 4)
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('API_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('API_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('API_THREADS', '4'))
+worker_class = 'gthread'
+
+# Import wsgi.py (and so load every curriculum) before forking workers
+preload_app = True
+
+def post_fork(server, worker):
+    # Threads don't survive fork, so each worker runs its own watcher.
+    # Until a curriculum changes, workers keep sharing the preloaded copy.
+    from app import start_curriculum_watcher
+    start_curriculum_watcher()
@@ -0,0 +1,210 @@
+"""
+Lazy loader for the rich module documents in modules/{subject}/{level}/{module}.json
+
+Discovery keeps only a lightweight index entry per file (path, size, mtime,
+title). Documents are read on demand into an LRU cache that is bounded by
+bytes rather than entry count, so memory stays flat however many modules
+exist on disk.
+"""
+
+from collections import OrderedDict, namedtuple
+import json
+import os
+import re
+import threading
+
+import codec
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modules')
+
+# Default byte budget of the document cache
+DEFAULT_CACHE_BYTES = int(os.environ.get('MODULE_CACHE_BYTES', 32 * 1024 * 1024))
+
+ModuleInfo = namedtuple('ModuleInfo', [
+    'subject',
+    'level',
+    'module_id',
+    'path',
+    'size',
+    'mtime',
+    'title',
+])
+
+# module_header comes first in every module file, so its title is found in
+# the first few KB without parsing the whole document
+_TITLE_RE = re.compile(rb'"module_title"\s*:\s*("(?:[^"\\]|\\.)*")')
+_TITLE_SCAN_BYTES = 4096
+
+def read_title(path):
+    """Read module_header.module_title from a module file, or None"""
+    with open(path, 'rb') as f:
+        head = f.read(_TITLE_SCAN_BYTES)
+        match = _TITLE_RE.search(head)
+        try:
+            if match:
+                return json.loads(match.group(1).decode('utf-8'))
+            # Unusual layout: fall back to a full parse
+            f.seek(0)
+            document = codec.loads(f.read())
+        except (ValueError, UnicodeDecodeError):
+            return None
+    header = document.get('module_header') if isinstance(document, dict) else None
+    title = header.get('module_title') if isinstance(header, dict) else None
+    return title if isinstance(title, str) else None
+
+def discover_modules(modules_dir=MODULES_DIR, previous=None):
+    """
+    Walk modules_dir and build the lightweight module index
+
+    Args:
+        modules_dir: Root of the {subject}/{level}/{module}.json tree
+        previous: Earlier index; titles of unchanged files are reused from it
+
+    Returns:
+        Dictionary of (subject, level, module_id) -> ModuleInfo
+    """
+    previous = previous or {}
+    index = {}
+
+    if not os.path.isdir(modules_dir):
+        return index
+
+    for subject_entry in sorted(os.scandir(modules_dir), key=lambda e: e.name):
+        if not subject_entry.is_dir():
+            continue
+        for level_entry in sorted(os.scandir(subject_entry.path), key=lambda e: e.name):
+            if not level_entry.is_dir():
+                continue
+            for file_entry in sorted(os.scandir(level_entry.path), key=lambda e: e.name):
+                if not file_entry.name.endswith('.json') or not file_entry.is_file():
+                    continue
+
+                key = (subject_entry.name, level_entry.name, file_entry.name[:-5])
+                stat = file_entry.stat()
+                old = previous.get(key)
+                if old is not None and (old.size, old.mtime) == (stat.st_size, stat.st_mtime):
+                    index[key] = old
+                    continue
+
+                try:
+                    title = read_title(file_entry.path)
+                except (OSError, UnicodeDecodeError, ValueError):
+                    title = None
+                index[key] = ModuleInfo(*key, file_entry.path, stat.st_size, stat.st_mtime, title)
+
+    return index
+
+class ModuleStore:
+    """
+    Index of the modules/ tree plus a byte-bounded LRU of loaded documents
+
+    By default a cached entry is the raw file bytes. Callers that want a
+    different representation (e.g. a pre-encoded response) pass build_entry,
+    which turns (ModuleInfo, raw_bytes) into the cached value, and
+    entry_size, which reports how many bytes that value accounts for.
+    """
+
+    def __init__(self, modules_dir=MODULES_DIR, max_bytes=DEFAULT_CACHE_BYTES,
+                 build_entry=None, entry_size=None):
+        self.modules_dir = modules_dir
+        self.max_bytes = max_bytes
+        self.build_entry = build_entry or (lambda info, raw: raw)
+        self.entry_size = entry_size or len
+
+        self._index = None
+        self._cache = OrderedDict()  # (subject, level, module_id) -> (info, entry, size)
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        """Current module index, discovered on first use"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = discover_modules(self.modules_dir)
+        return self._index
+
+    def restore(self, index):
+        """
+        Start from a previously discovered index, e.g. one kept in a snapshot
+
+        Titles are not re-read; the next refresh() revalidates every entry
+        against its file's size and mtime.
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = index
+
+    def refresh(self):
+        """
+        Rescan the tree and drop cached documents whose file changed
+
+        Returns:
+            True if any module was added, removed or modified
+        """
+        old_index = self._index or {}
+        new_index = discover_modules(self.modules_dir, previous=old_index)
+        changed = new_index != old_index
+
+        with self._lock:
+            # Whole-index swap; readers hold on to whichever dict they fetched.
+            # An unchanged index is kept, so its identity marks a version.
+            if changed:
+                self._index = new_index
+            for key in list(self._cache):
+                if new_index.get(key) != self._cache[key][0]:
+                    self._evict(key)
+        return changed
+
+    def info(self, subject, level, module_id):
+        """ModuleInfo of a module, or None if it doesn't exist"""
+        return self.index.get((subject, level, module_id))
+
+    def list(self, subject=None, level=None):
+        """ModuleInfo entries in path order, optionally filtered"""
+        return [info for info in self.index.values()
+                if (subject is None or info.subject == subject)
+                and (level is None or info.level == level)]
+
+    def get(self, subject, level, module_id):
+        """
+        Cached entry of a module, loading it from disk on a miss
+
+        Returns:
+            The entry built by build_entry, or None if the module doesn't exist
+        """
+        key = (subject, level, module_id)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        info = self.info(subject, level, module_id)
+        if info is None:
+            return None
+
+        try:
+            with open(info.path, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+
+        entry = self.build_entry(info, raw)
+        size = self.entry_size(entry)
+
+        with self._lock:
+            if key in self._cache:
+                self._evict(key)
+            # Entries larger than the whole budget are served but not kept
+            if size <= self.max_bytes:
+                self._cache[key] = (info, entry, size)
+                self._cache_bytes += size
+                while self._cache_bytes > self.max_bytes:
+                    self._evict(next(iter(self._cache)))
+        return entry
+
+    def _evict(self, key):
+        _, _, size = self._cache.pop(key)
+        self._cache_bytes -= size
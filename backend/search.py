@@ -0,0 +1,165 @@
+"""
+Full-text search over module content with BM25 ranking
+
+An inverted index maps each term to the documents containing it. Field
+boosts and BM25 length normalisation are folded into a per-posting impact
+score at build time, so a query only sums impacts over the postings of its
+own terms and never scans the document table.
+"""
+
+from array import array
+from collections import Counter, defaultdict, namedtuple
+import heapq
+import math
+import re
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Relative weight of a term occurrence in each field
+FIELD_BOOSTS = {
+    'title': 3.0,
+    'definition': 2.0,
+    'concept_overview': 1.5,
+    'key_takeaways': 1.5,
+    'ai_summary': 1.2,
+    'theory': 1.0,
+    'common_mistakes': 0.8,
+}
+
+STOPWORDS = frozenset('''
+a an and are as at be been but by can do does for from has have how if in into
+is it its not of on or so such than that the their then there these this those
+to was we were what when which while who why will with you your
+'''.split())
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+SearchDocument = namedtuple('SearchDocument', ['subject', 'level', 'module_id', 'title', 'source'])
+
+def stem(token):
+    """Very light plural stripping so 'equations' matches 'equation'"""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    """Lowercase, split on non-alphanumerics, drop stopwords, stem"""
+    return [stem(token) for token in _TOKEN_RE.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+def flatten_text(value):
+    """Join all strings nested in a str / list / dict value"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return ' '.join(flatten_text(item) for item in value)
+    if isinstance(value, dict):
+        return ' '.join(flatten_text(item) for item in value.values())
+    return ''
+
+def module_fields(document):
+    """Searchable fields of a rich module document from modules/"""
+    return {
+        'title': document.get('module_header', {}).get('module_title', ''),
+        'definition': flatten_text(document.get('definition', '')),
+        'theory': flatten_text(document.get('theory', '')),
+        'concept_overview': flatten_text(document.get('concept_overview', [])),
+        'key_takeaways': flatten_text(document.get('key_takeaways', [])),
+        'common_mistakes': flatten_text(document.get('common_mistakes', [])),
+        'ai_summary': flatten_text(document.get('ai_summary', {})),
+    }
+
+def curriculum_fields(module):
+    """Searchable fields of a module from a legacy *_curriculum.json file"""
+    core = module.get('core_content', {})
+    return {
+        'title': module.get('module_name', ''),
+        'theory': flatten_text(core.get('theory', '')),
+    }
+
+def analyze(fields):
+    """Boost-weighted term frequencies of one document's fields"""
+    weighted = Counter()
+    for field, text in fields.items():
+        boost = FIELD_BOOSTS.get(field, 1.0)
+        for token in tokenize(text or ''):
+            weighted[token] += boost
+    return weighted
+
+def score_postings(doc_terms):
+    """
+    Turn per-document weighted term frequencies into BM25 impact postings
+
+    Args:
+        doc_terms: List of {term: weighted_tf}, indexed by doc id
+
+    Returns:
+        Dictionary of term -> (doc_ids array('I'), impacts array('f'))
+    """
+    lengths = [sum(terms.values()) for terms in doc_terms]
+    avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+    doc_freq = Counter(term for terms in doc_terms for term in terms)
+    total = len(doc_terms)
+
+    by_term = defaultdict(lambda: (array('I'), array('f')))
+    for doc_id, terms in enumerate(doc_terms):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / avg_length) if avg_length else BM25_K1
+        for term, tf in terms.items():
+            idf = math.log(1 + (total - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            doc_ids, impacts = by_term[term]
+            doc_ids.append(doc_id)
+            impacts.append(idf * tf * (BM25_K1 + 1) / (tf + norm))
+    return dict(by_term)
+
+class SearchIndex:
+    """
+    Immutable BM25 index
+
+    postings maps term -> (doc_ids, impacts): two parallel arrays, where
+    impacts[i] is the term's full BM25 contribution to doc_ids[i]. Any
+    object with a dict-like get() works, which is how search_store serves
+    postings straight from a memory-mapped file.
+    """
+
+    def __init__(self, documents, postings):
+        self.documents = documents
+        self.postings = postings
+
+    @classmethod
+    def build(cls, entries):
+        """
+        Build an index from (SearchDocument, fields) pairs
+
+        fields maps a FIELD_BOOSTS name to the text of that field.
+        """
+        documents = [document for document, _ in entries]
+        doc_terms = [analyze(fields) for _, fields in entries]
+        return cls(documents, score_postings(doc_terms))
+
+    def search(self, query, subject=None, level=None, limit=10):
+        """
+        Rank documents for a query
+
+        Returns:
+            List of (score, SearchDocument), best first
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            for doc_id, impact in zip(*posting):
+                scores[doc_id] += impact
+
+        documents = self.documents
+        if subject or level:
+            scores = {doc_id: score for doc_id, score in scores.items()
+                      if (not subject or documents[doc_id].subject == subject)
+                      and (not level or documents[doc_id].level == level)}
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(score, documents[doc_id]) for doc_id, score in best]
@@ -0,0 +1,288 @@
+"""
+Persistent, memory-mapped storage for the search index
+
+The index file holds the term dictionary, postings, document table, a
+forward index (per-document term weights) and a manifest of the source
+files it was built from. Opening it is an mmap plus a header read, so a new
+worker is ready in milliseconds and all workers share the same page cache.
+
+update_index() re-reads only the source files whose mtime/size changed and
+whose content hash differs. Unchanged documents are taken from the forward
+index, BM25 impacts are recomputed (they depend on corpus-wide statistics)
+and a new file is swapped in with os.replace, so readers of the old file
+are never disturbed.
+
+File layout (the header is little-endian; arrays use native byte order,
+as the file is a per-machine cache rather than a portable artifact):
+    header   magic, version, counts, then (offset, length) of each section
+    docs         JSON list of [subject, level, module_id, title, source]
+    sources      JSON {key: {mtime, size, sha256, docs: [doc_id, ...]}}
+    term_offs    u32[n_terms + 1]   byte offsets into term_blob
+    term_blob    utf-8 terms, sorted bytewise
+    term_post    u32[n_terms + 1]   first posting of each term
+    post_docs    u32[n_postings]
+    post_impact  f32[n_postings]
+    fwd_start    u32[n_docs + 1]    first forward entry of each document
+    fwd_terms    u32[n_postings]    term ids
+    fwd_tf       f32[n_postings]    boost-weighted term frequency
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+import hashlib
+import mmap
+import os
+import struct
+
+import codec
+from search import SearchDocument, SearchIndex, analyze, score_postings
+
+MAGIC = b'DTLSRCH1'
+VERSION = 1
+
+_SECTIONS = ['docs', 'sources', 'term_offs', 'term_blob', 'term_post',
+             'post_docs', 'post_impact', 'fwd_start', 'fwd_terms', 'fwd_tf']
+_HEADER = struct.Struct('<8sIIII' + 'QQ' * len(_SECTIONS))
+_ALIGN = 8
+
+# A file the index is built from. extract(raw_bytes) returns the
+# (SearchDocument, fields) pairs found in it; a file it can't make sense of
+# (any ValueError, AttributeError, TypeError...) is indexed as empty.
+IndexSource = namedtuple('IndexSource', ['key', 'path', 'extract'])
+
+def _as_bytes(values, typecode):
+    return array(typecode, values).tobytes()
+
+class _MappedPostings:
+    """Dict-like term -> (doc_ids, impacts) view over the mapped file"""
+
+    def __init__(self, index):
+        self._index = index
+
+    def get(self, term, default=None):
+        term_id = self._index.term_id(term)
+        if term_id is None:
+            return default
+        start, end = self._index.term_post[term_id], self._index.term_post[term_id + 1]
+        return self._index.post_docs[start:end], self._index.post_impact[start:end]
+
+class _TermList:
+    """Sequence view of the sorted term dictionary, for bisect"""
+
+    def __init__(self, index):
+        self._index = index
+
+    def __len__(self):
+        return self._index.n_terms
+
+    def __getitem__(self, term_id):
+        return self._index.term_bytes(term_id)
+
+class MappedSearchIndex(SearchIndex):
+    """SearchIndex whose postings are read directly from a memory-mapped file"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = _HEADER.unpack_from(self._mmap, 0)
+        magic, version, self.n_docs, self.n_terms, self.n_postings = header[:5]
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'Not a version {VERSION} search index: {path}')
+
+        view = memoryview(self._mmap)
+        self._sections = {}
+        for i, name in enumerate(_SECTIONS):
+            offset, length = header[5 + 2 * i], header[6 + 2 * i]
+            self._sections[name] = view[offset:offset + length]
+
+        typed = {'term_offs': 'I', 'term_post': 'I', 'post_docs': 'I',
+                 'post_impact': 'f', 'fwd_start': 'I', 'fwd_terms': 'I', 'fwd_tf': 'f'}
+        for name, typecode in typed.items():
+            setattr(self, name, self._sections[name].cast(typecode))
+        self.term_blob = self._sections['term_blob']
+
+        documents = [SearchDocument(*row) for row in codec.loads(bytes(self._sections['docs']))]
+        super().__init__(documents, _MappedPostings(self))
+        self.path = path
+        self._sources = None
+
+    @property
+    def sources(self):
+        """Manifest of the files the index was built from (parsed on demand)"""
+        if self._sources is None:
+            self._sources = codec.loads(bytes(self._sections['sources']))
+        return self._sources
+
+    def term_bytes(self, term_id):
+        return bytes(self.term_blob[self.term_offs[term_id]:self.term_offs[term_id + 1]])
+
+    def term_id(self, term):
+        """Id of a term via binary search over the dictionary, or None"""
+        key = term.encode('utf-8')
+        term_id = bisect_left(_TermList(self), key)
+        if term_id < self.n_terms and self.term_bytes(term_id) == key:
+            return term_id
+        return None
+
+    def doc_terms(self, doc_id):
+        """Weighted term frequencies of one document, from the forward index"""
+        start, end = self.fwd_start[doc_id], self.fwd_start[doc_id + 1]
+        return {self.term_bytes(term_id).decode('utf-8'): tf
+                for term_id, tf in zip(self.fwd_terms[start:end], self.fwd_tf[start:end])}
+
+def write_index(path, documents, doc_terms, sources):
+    """
+    Write an index file atomically
+
+    Args:
+        path: Destination file
+        documents: List of SearchDocument, indexed by doc id
+        doc_terms: List of {term: weighted_tf}, indexed by doc id
+        sources: Manifest {key: {mtime, size, sha256, docs}}
+    """
+    postings = score_postings(doc_terms)
+    terms = sorted(postings, key=lambda term: term.encode('utf-8'))
+    term_ids = {term: term_id for term_id, term in enumerate(terms)}
+
+    term_offs, term_blob = [0], bytearray()
+    term_post, post_docs, post_impact = [0], array('I'), array('f')
+    for term in terms:
+        term_blob += term.encode('utf-8')
+        term_offs.append(len(term_blob))
+        doc_ids, impacts = postings[term]
+        post_docs.extend(doc_ids)
+        post_impact.extend(impacts)
+        term_post.append(len(post_docs))
+
+    fwd_start, fwd_terms, fwd_tf = [0], [], []
+    for terms_of_doc in doc_terms:
+        for term, tf in terms_of_doc.items():
+            fwd_terms.append(term_ids[term])
+            fwd_tf.append(tf)
+        fwd_start.append(len(fwd_terms))
+
+    payloads = {
+        'docs': codec.dumps([list(document) for document in documents]),
+        'sources': codec.dumps(sources),
+        'term_offs': _as_bytes(term_offs, 'I'),
+        'term_blob': bytes(term_blob),
+        'term_post': _as_bytes(term_post, 'I'),
+        'post_docs': _as_bytes(post_docs, 'I'),
+        'post_impact': _as_bytes(post_impact, 'f'),
+        'fwd_start': _as_bytes(fwd_start, 'I'),
+        'fwd_terms': _as_bytes(fwd_terms, 'I'),
+        'fwd_tf': _as_bytes(fwd_tf, 'f'),
+    }
+
+    offsets = []
+    body = bytearray()
+    position = _HEADER.size
+    for name in _SECTIONS:
+        padding = -position % _ALIGN
+        body += b'\0' * padding
+        position += padding
+        offsets += [position, len(payloads[name])]
+        body += payloads[name]
+        position += len(payloads[name])
+
+    header = _HEADER.pack(MAGIC, VERSION, len(documents), len(terms), len(post_docs), *offsets)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+def open_index(path):
+    """MappedSearchIndex for path, or None if it is missing or unreadable"""
+    try:
+        return MappedSearchIndex(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+def update_index(path, sources, current=None):
+    """
+    Bring the index file at path up to date with its sources
+
+    Args:
+        path: Index file
+        sources: List of IndexSource
+        current: Already opened MappedSearchIndex of path, if any
+
+    Returns:
+        Tuple of (index, stats). index is a MappedSearchIndex, or an
+        in-memory SearchIndex if the file could not be written. stats
+        counts reused, reindexed and removed source files.
+    """
+    previous = current if current is not None else open_index(path)
+    old_sources = previous.sources if previous is not None else {}
+
+    # Stat every source first: when nothing changed the previous index is
+    # returned without touching its forward index
+    plan = []
+    changed = False
+    for source in sources:
+        try:
+            stat = os.stat(source.path)
+        except OSError:
+            continue
+        old = old_sources.get(source.key)
+        
+        raw = sha256 = None
+        if old is None or (old['mtime'], old['size']) != (stat.st_mtime, stat.st_size):
+            try:
+                with open(source.path, 'rb') as f:
+                    raw = f.read()
+            except OSError:
+                continue
+            sha256 = hashlib.sha256(raw).hexdigest()
+            changed = True  # At least the manifest needs rewriting
+        plan.append((source, stat, old, raw, sha256))
+
+    stats = {'reused': 0, 'reindexed': 0, 'removed': 0}
+    stats['removed'] = len(set(old_sources) - {source.key for source, *_ in plan})
+    if previous is not None and not changed and not stats['removed']:
+        stats['reused'] = len(plan)
+        return previous, stats
+
+    documents, doc_terms, manifest = [], [], {}
+    for source, stat, old, raw, sha256 in plan:
+        first_doc = len(documents)
+        if old is not None and (sha256 is None or sha256 == old['sha256']):
+            for doc_id in old['docs']:
+                documents.append(previous.documents[doc_id])
+                doc_terms.append(previous.doc_terms(doc_id))
+            sha256 = old['sha256']
+            stats['reused'] += 1
+        else:
+            # Extracted in full before anything is added, so a malformed
+            # file leaves no partial entries; it stays out of the index
+            # until it changes again
+            try:
+                entries = [(document, analyze(fields)) for document, fields in source.extract(raw)]
+            except (ValueError, UnicodeDecodeError, AttributeError, TypeError) as e:
+                print(f"Error: Could not index {source.path}: {str(e)}")
+                entries = []
+            for document, terms in entries:
+                documents.append(document)
+                doc_terms.append(terms)
+            stats['reindexed'] += 1
+        
+        manifest[source.key] = {
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'sha256': sha256,
+            'docs': list(range(first_doc, len(documents)))
+        }
+
+    try:
+        write_index(path, documents, doc_terms, manifest)
+        index = MappedSearchIndex(path)
+    except OSError as e:
+        print(f"Error: Could not write search index {path}: {str(e)}")
+        index = SearchIndex(documents, score_postings(doc_terms))
+    return index, stats
@@ -0,0 +1,72 @@
+"""
+Binary snapshot of the parsed and indexed content, for fast cold starts
+
+Parsing the curricula and building the lookup maps and the suggestion index
+is repeated by every worker start, although the content rarely changes. The
+snapshot file keeps that state as one pickle, tagged with the hashes of the
+files it was derived from. A section is only used while those hashes still
+match; anything stale is rebuilt from JSON as before and the next snapshot
+picks it up.
+
+The file is a per-machine cache written by this backend (like the search
+index), not an exchange format: it is only ever read from the local cache
+directory, never from user input.
+
+File layout:
+    header   magic, version, pickle protocol
+    payload  pickle of {section: (fingerprint, state)}
+"""
+
+import os
+import pickle
+import struct
+
+MAGIC = b'DTLSNAP1'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sII')
+
+def read_snapshot(path):
+    """
+    Sections of the snapshot file at path
+
+    Returns:
+        Dictionary of section -> (fingerprint, state); empty if the file is
+        missing, unreadable or written by another version
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, protocol = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or protocol > pickle.HIGHEST_PROTOCOL:
+            return {}
+        sections = pickle.loads(memoryview(data)[_HEADER.size:])
+    except (OSError, struct.error, pickle.UnpicklingError, EOFError,
+            AttributeError, ImportError, TypeError, ValueError):
+        return {}
+    return sections if isinstance(sections, dict) else {}
+
+def write_snapshot(path, sections):
+    """
+    Write a snapshot file atomically
+
+    Args:
+        path: Destination file
+        sections: Dictionary of section -> (fingerprint, state)
+    """
+    protocol = pickle.HIGHEST_PROTOCOL
+    payload = pickle.dumps(sections, protocol=protocol)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, protocol))
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+def section(sections, name, fingerprint):
+    """State of a section if it was built from the same sources, else None"""
+    stored = sections.get(name)
+    if stored is None or stored[0] != fingerprint:
+        return None
+    return stored[1]
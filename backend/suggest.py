@@ -0,0 +1,138 @@
+"""
+Prefix suggestions (typeahead) over module names, concepts and glossary terms
+
+Keys live in one sorted array and a prefix query is two binary searches.
+Titles are also keyed from every word start, so "equa" finds "Linear
+Equations". For short prefixes the matching range can be most of the
+array, so the top results of every prefix up to PRECOMPUTED_PREFIX_LEN
+characters are computed at build time. Query cost then stays flat as the
+number of terms grows.
+"""
+
+from bisect import bisect_left
+from collections import namedtuple
+import heapq
+import re
+
+# Prefixes up to this length are answered from a precomputed table
+PRECOMPUTED_PREFIX_LEN = 3
+
+# Most suggestions returned per query
+MAX_SUGGESTIONS = 20
+
+# Lower sorts first
+KIND_ORDER = {'module': 0, 'glossary': 1, 'concept': 2}
+LEVEL_ORDER = {'beginner': 0, 'intermediate': 1, 'advanced': 2}
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+Suggestion = namedtuple('Suggestion', ['text', 'kind', 'subject', 'level', 'module_id'])
+
+def normalize(text):
+    """Lowercase and collapse everything but letters and digits to single spaces"""
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+def glossary_terms(glossary):
+    """Terms of a glossary given as {term: definition} or [{"term": ...}, ...]"""
+    if isinstance(glossary, dict):
+        return [term for term in glossary if isinstance(term, str)]
+    if isinstance(glossary, list):
+        return [item.get('term') if isinstance(item, dict) else item
+                for item in glossary
+                if isinstance(item, str) or (isinstance(item, dict) and item.get('term'))]
+    return []
+
+class SuggestIndex:
+    """Immutable sorted-array prefix index"""
+
+    def __init__(self, suggestions, keys, key_targets, key_ranks, precomputed):
+        self.suggestions = suggestions  # suggestion id -> Suggestion
+        self.keys = keys                # sorted normalized keys
+        self.key_targets = key_targets  # parallel: suggestion id of each key
+        self.key_ranks = key_ranks      # parallel: rank of each key, lower is better
+        self.precomputed = precomputed  # (subject or None, short prefix) -> ranked ids
+
+    @classmethod
+    def build(cls, entries):
+        """
+        Build the index from (Suggestion, position) pairs
+
+        position orders suggestions of the same kind and level, e.g. the
+        module's place in the roadmap.
+        """
+        suggestions = []
+        seen = {}
+        keyed = []
+        for suggestion, position in entries:
+            text = normalize(suggestion.text)
+            if not text:
+                continue
+            # The same text is suggested once per subject; earlier entries win
+            identity = (text, suggestion.kind, suggestion.subject)
+            if identity in seen:
+                continue
+            seen[identity] = suggestion_id = len(suggestions)
+            suggestions.append(suggestion)
+
+            kind_rank = KIND_ORDER.get(suggestion.kind, len(KIND_ORDER))
+            order_rank = (LEVEL_ORDER.get(suggestion.level, len(LEVEL_ORDER)), position)
+            keyed.append((text, (kind_rank, 0) + order_rank, suggestion_id))
+
+            # Titles can also be completed from any word, ranked below full-prefix
+            # matches of the same kind
+            if suggestion.kind != 'concept':
+                words = text.split(' ')
+                for i in range(1, len(words)):
+                    keyed.append((' '.join(words[i:]), (kind_rank, 1) + order_rank, suggestion_id))
+
+        keyed.sort()
+        keys = [key for key, _, _ in keyed]
+        key_ranks = [rank for _, rank, _ in keyed]
+        key_targets = [suggestion_id for _, _, suggestion_id in keyed]
+
+        # Top suggestions for every short prefix, overall and per subject,
+        # so broad queries never scan
+        candidates = {}
+        for key, rank, suggestion_id in keyed:
+            subject = suggestions[suggestion_id].subject
+            for length in range(1, min(len(key), PRECOMPUTED_PREFIX_LEN) + 1):
+                candidates.setdefault((None, key[:length]), []).append((rank, suggestion_id))
+                candidates.setdefault((subject, key[:length]), []).append((rank, suggestion_id))
+        precomputed = {prefix: cls._top(ranked, MAX_SUGGESTIONS)
+                       for prefix, ranked in candidates.items()}
+
+        return cls(suggestions, keys, key_targets, key_ranks, precomputed)
+
+    @staticmethod
+    def _top(ranked, limit):
+        """Best-ranked distinct suggestion ids from (rank, suggestion_id) pairs"""
+        best = {}
+        for rank, suggestion_id in ranked:
+            if suggestion_id not in best or rank < best[suggestion_id]:
+                best[suggestion_id] = rank
+        return [suggestion_id for suggestion_id, _ in
+                heapq.nsmallest(limit, best.items(), key=lambda item: item[1])]
+
+    def suggest(self, prefix, limit=10, subject=None):
+        """
+        Suggestions whose text (or a word in a title) starts with prefix
+
+        Returns:
+            List of Suggestion, best first
+        """
+        prefix = normalize(prefix)
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        if not prefix:
+            return []
+
+        if len(prefix) <= PRECOMPUTED_PREFIX_LEN:
+            ids = self.precomputed.get((subject or None, prefix), [])
+        else:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix + '\uffff', lo)
+            suggestions = self.suggestions
+            ranked = ((self.key_ranks[i], self.key_targets[i]) for i in range(lo, hi)
+                      if not subject or suggestions[self.key_targets[i]].subject == subject)
+            ids = self._top(ranked, limit)
+
+        return [self.suggestions[suggestion_id] for suggestion_id in ids[:limit]]
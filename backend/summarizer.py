@@ -0,0 +1,191 @@
+"""
+Extractive summarizer for module theory text
+
+Sentences are found with a single compiled regex that keeps decimals,
+common abbreviations and LaTeX math spans intact. They are then ranked with
+TextRank over TF-IDF sentence vectors. The similarity matrix and the power
+iteration are plain NumPy matrix operations over all sentences of a text at
+once. Recent summaries are kept in a bounded cache keyed by content hash,
+so a text that comes back is not summarized again.
+
+    python summarizer.py     # summarize every module under modules/ and time it
+"""
+
+import hashlib
+import re
+
+import numpy as np
+
+from search import tokenize
+
+# Upper bounds of a summary
+SUMMARY_MAX_SENTENCES = 3
+SUMMARY_MAX_CHARS = 400
+
+# Sentences shorter than this are never picked (headings, "Where:", ...)
+MIN_SENTENCE_CHARS = 60
+
+# TextRank parameters
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+# Extra weight for early sentences, which usually introduce the topic
+LEAD_WEIGHT = 0.5
+
+# Periods after these words don't end a sentence, in any letter case
+_ABBREVIATIONS = ['e.g', 'i.e', 'etc', 'vs', 'cf', 'approx', 'Dr', 'Mr', 'Mrs', 'Ms', 'Prof', 'Fig', 'Eq']
+_ABBREVIATION_PERIOD = '(?i:' + '|'.join(r'(?<=\b' + re.escape(word) + ')' for word in _ABBREVIATIONS) + r')\.'
+
+# Display math neither nests nor spans a paragraph break, so an unterminated
+# $$ or \[ costs one scan to the next opener or blank line, not to the end of
+# the text
+def _display_math(opener, closer):
+    return opener + r'(?:(?!\n\s*\n|' + opener + ').)*?' + closer
+
+# Ordinary text is consumed in runs, so matching stays fast on long texts
+SENTENCE_RE = re.compile(r'''
+    (?:
+        ''' + _display_math(r'\$\$', r'\$\$') + r'''       # display math $$ ... $$
+      | ''' + _display_math(r'\\\[', r'\\\]') + r'''       # display math \[ ... \]
+      | \$[^$\n]*\$                 # inline math $ ... $
+      | ```.*?```                   # code block
+      | [^.!?\n$\\`]+               # run of ordinary characters
+      | ''' + _ABBREVIATION_PERIOD + r'''
+      | [.!?](?=[^\s.!?])           # punctuation inside a token (3.14, file.c)
+      | \n(?!\s*\n)                 # single line break
+      | [$\\`]                      # lone dollar sign, backslash or backtick
+    )+
+    (?:[.!?]+|(?=\n\s*\n)|$)        # sentence end, paragraph break or end of text
+''', re.VERBOSE | re.DOTALL)
+
+_CACHE = {}  # (sha256 of text, max_sentences, max_chars) -> summary
+CACHE_MAX_ENTRIES = 4096
+
+def split_sentences(text):
+    """Split text into sentences"""
+    return [sentence for sentence in
+            (match.group().strip() for match in SENTENCE_RE.finditer(text))
+            if sentence]
+
+def rank_sentences(sentences):
+    """
+    TextRank score of each sentence
+
+    Returns:
+        NumPy array of scores, parallel to sentences
+    """
+    count = len(sentences)
+    if count == 0:
+        return np.zeros(0)
+
+    vocabulary = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for token in tokenize(sentence):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    counts = np.zeros((count, max(len(vocabulary), 1)))
+    np.add.at(counts, (rows, cols), 1.0)
+
+    # TF-IDF with sentences as documents, then cosine similarity
+    doc_freq = (counts > 0).sum(axis=0)
+    tfidf = counts * (np.log((1 + count) / (1 + doc_freq)) + 1)
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    unit = np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+    similarity = unit @ unit.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-stochastic transition matrix; isolated sentences jump uniformly
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, row_sums,
+                           out=np.full_like(similarity, 1.0 / count), where=row_sums > 0)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+
+    lead = 1.0 + LEAD_WEIGHT / (1.0 + np.arange(count) / 5.0)
+    return scores * lead
+
+def is_candidate(sentence):
+    """Whether a sentence can stand alone in a summary"""
+    return (len(sentence) >= MIN_SENTENCE_CHARS
+            and not sentence.startswith(('$', '\\', '-', '*', '`', '|'))
+            and not sentence.endswith(':')
+            and '\\[' not in sentence and '$$' not in sentence)
+
+def summarize(text, max_sentences=SUMMARY_MAX_SENTENCES, max_chars=SUMMARY_MAX_CHARS):
+    """
+    Extractive summary of text: its highest-ranked sentences, in original order
+
+    Returns:
+        Summary string, or '' if text is empty
+    """
+    if not text or not text.strip():
+        return ''
+
+    key = (hashlib.sha256(text.encode('utf-8')).hexdigest(), max_sentences, max_chars)
+    summary = _CACHE.get(key)
+    if summary is not None:
+        return summary
+
+    sentences = split_sentences(text)
+    candidates = [i for i, sentence in enumerate(sentences) if is_candidate(sentence)]
+
+    if not candidates:
+        summary = text.strip()[:max_chars]
+    else:
+        scores = rank_sentences(sentences)
+        chosen, used = [], 0
+        for i in sorted(candidates, key=lambda i: (-scores[i], i)):
+            length = len(sentences[i]) + (1 if chosen else 0)
+            if used + length <= max_chars:
+                chosen.append(i)
+                used += length
+                if len(chosen) == max_sentences:
+                    break
+        if chosen:
+            summary = ' '.join(sentences[i] for i in sorted(chosen))
+        else:
+            # Even the best sentence is too long: cut it at a word boundary
+            best = sentences[max(candidates, key=lambda i: scores[i])]
+            summary = best[:max_chars].rsplit(' ', 1)[0] + '...'
+
+    if len(_CACHE) >= CACHE_MAX_ENTRIES:
+        _CACHE.pop(next(iter(_CACHE), None), None)
+    _CACHE[key] = summary
+    return summary
+
+def summarize_many(texts, **kwargs):
+    """Summaries of several texts, e.g. every module at startup or build time"""
+    return [summarize(text, **kwargs) for text in texts]
+
+if __name__ == '__main__':
+    import glob
+    import os
+    import time
+
+    import codec
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'modules')
+    paths = sorted(glob.glob(os.path.join(root, '*', '*', '*.json')))
+    texts = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            theory = codec.loads(f.read()).get('theory', '')
+        texts.append('\n\n'.join(theory) if isinstance(theory, list) else theory)
+
+    start = time.perf_counter()
+    summaries = summarize_many(texts)
+    elapsed = time.perf_counter() - start
+
+    sentence_total = sum(len(split_sentences(text)) for text in texts)
+    print(f"Summarized {len(texts)} modules ({sentence_total} sentences) in {elapsed * 1000:.1f} ms")
+    for path, summary in list(zip(paths, summaries))[:3]:
+        print(f"\n{os.path.relpath(path, root)}:\n  {summary}")
@@ -0,0 +1,22 @@
+"""
+Production WSGI entry point
+
+Loads and indexes every curriculum at import time. With gunicorn's
+preload_app (see gunicorn.conf.py) this happens once in the master
+process, and the forked workers share the parsed data copy-on-write.
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import gc
+
+from app import app, preload_curricula
+
+missing = preload_curricula()
+if missing:
+    print(f"WARNING: curricula not loaded: {', '.join(missing)}")
+
+# Move everything loaded so far out of the collector's generations, so
+# garbage collection in the workers doesn't write to (and copy) shared pages
+gc.freeze()
@@ -0,0 +1,294 @@
+"""
+Frontend Build Step
+Minifies and content-hashes the frontend assets and precompresses everything
+
+    python build_frontend.py
+
+Writes dist/, a ready-to-serve copy of frontend/ (plus modules/):
+- js/*.js and css/*.css are minified and renamed to name.<hash>.ext, so
+  they can be cached forever; module.html and roadmap.html are rewritten
+  to point at the hashed names
+- every text file gets .gz (and, with the optional brotli package, .br)
+  siblings that serve_frontend.py picks by Accept-Encoding
+- asset-manifest.json maps each original asset path to its hashed path
+
+serve_frontend.py serves dist/ whenever it exists, so rebuild after editing
+the frontend (or delete dist/ to serve frontend/ directly).
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import brotli  # Optional: smaller .br variants
+except ImportError:
+    brotli = None
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT_DIR, "frontend")
+MODULES_DIR = os.path.join(ROOT_DIR, "modules")
+DIST_DIR = os.path.join(ROOT_DIR, "dist")
+
+HTML_PAGES = ["module.html", "roadmap.html"]
+
+# Files with these extensions get precompressed siblings
+COMPRESSIBLE = ('.html', '.js', '.css', '.json', '.svg', '.txt')
+
+# Smaller files are not worth compressing
+COMPRESS_MIN_SIZE = 512
+
+HASH_LENGTH = 10
+
+# ============ MINIFICATION ============
+
+# A '/' after one of these (or one of these keywords) starts a regex literal
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case', 'do', 'else'}
+
+def _string_end(source, i):
+    """Index after the quoted string starting at i"""
+    quote = source[i]
+    i += 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+def _regex_end(source, i):
+    """Index after the regex literal (and its flags) starting at i"""
+    i += 1
+    in_class = False
+    while i < len(source):
+        c = source[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            break
+        elif c == '\n':
+            raise ValueError(f"Unterminated regex literal at {i}")
+        i += 1
+    i += 1
+    while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+        i += 1
+    return i
+
+def _last_word(out):
+    text = ''.join(out[-3:])
+    match = re.search(r'([A-Za-z_$][\w$]*)\s*$', text)
+    return match.group(1) if match else ''
+
+def minify_js(source):
+    """
+    Strip comments and indentation from JavaScript
+
+    Conservative by design: line breaks are kept so automatic semicolon
+    insertion is unaffected, and strings, template literals and regex
+    literals are copied verbatim.
+    """
+    out = []
+    stack = ['code']  # 'code' or 'template'; code inside ${...} tracks its brace depth
+    depths = []
+    i, n = 0, len(source)
+    prev = ''  # Last significant character emitted in code
+
+    while i < n:
+        c = source[i]
+
+        if stack[-1] == 'template':
+            if c == '\\':
+                out.append(source[i:i + 2])
+                i += 2
+            elif c == '`':
+                out.append(c)
+                stack.pop()
+                prev = c
+                i += 1
+            elif source.startswith('${', i):
+                out.append('${')
+                stack.append('code')
+                depths.append(0)
+                prev = '{'
+                i += 2
+            else:
+                out.append(c)
+                i += 1
+            continue
+
+        if c in '"\'':
+            end = _string_end(source, i)
+            out.append(source[i:end])
+            prev = c
+            i = end
+        elif c == '`':
+            out.append(c)
+            stack.append('template')
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            comment = source[i:n if end < 0 else end + 2]
+            out.append('\n' if '\n' in comment else ' ')
+            i = n if end < 0 else end + 2
+        elif c == '/' and (prev == '' or prev in _REGEX_PRECEDERS or _last_word(out) in _REGEX_KEYWORDS):
+            end = _regex_end(source, i)
+            out.append(source[i:end])
+            prev = '/'
+            i = end
+        else:
+            if depths and c in '{}':
+                if c == '{':
+                    depths[-1] += 1
+                elif depths[-1] == 0:
+                    # Closes a ${...} expression
+                    depths.pop()
+                    stack.pop()
+                    out.append(c)
+                    i += 1
+                    continue
+                else:
+                    depths[-1] -= 1
+            out.append(c)
+            if not c.isspace():
+                prev = c
+            i += 1
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line) + '\n'
+
+def _compact_css(css):
+    """Drop the whitespace around CSS punctuation (in code outside strings)"""
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}')
+
+def minify_css(source):
+    """Strip comments and insignificant whitespace from CSS"""
+    parts = []  # Compacted code and verbatim strings, in order
+    code = []
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if c in '"\'':
+            end = _string_end(source, i)
+            parts.append(_compact_css(''.join(code)))
+            parts.append(source[i:end])
+            code = []
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif c.isspace():
+            while i < n and source[i].isspace():
+                i += 1
+            code.append(' ')
+        else:
+            code.append(c)
+            i += 1
+    parts.append(_compact_css(''.join(code)))
+    return ''.join(parts).strip() + '\n'
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+# ============ BUILD ============
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def write_file(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def write_compressed(path, data):
+    """Write the .gz / .br siblings of a file, returning how many were written"""
+    if not path.endswith(COMPRESSIBLE) or len(data) < COMPRESS_MIN_SIZE:
+        return 0
+    # mtime=0 keeps the .gz output identical between builds of the same content
+    write_file(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is None:
+        return 1
+    write_file(path + '.br', brotli.compress(data, quality=11))
+    return 2
+
+def build_assets(manifest):
+    """Minify and hash js/ and css/; returns the number of bytes saved"""
+    saved = 0
+    for folder in ('js', 'css'):
+        for name in sorted(os.listdir(os.path.join(SOURCE_DIR, folder))):
+            base, ext = os.path.splitext(name)
+            if ext not in MINIFIERS:
+                continue
+            with open(os.path.join(SOURCE_DIR, folder, name), encoding='utf-8') as f:
+                source = f.read()
+            data = MINIFIERS[ext](source).encode('utf-8')
+            saved += len(source.encode('utf-8')) - len(data)
+
+            hashed = f"{folder}/{base}.{content_hash(data)}{ext}"
+            manifest[f"{folder}/{name}"] = hashed
+            path = os.path.join(DIST_DIR, hashed)
+            write_file(path, data)
+            write_compressed(path, data)
+    return saved
+
+def rewrite_references(html, manifest):
+    """Point src/href attributes of the HTML at the hashed asset names"""
+    def replace(match):
+        return f'{match.group(1)}="{manifest.get(match.group(2), match.group(2))}"'
+    return re.sub(r'\b(src|href)="([^"#?]+)"', replace, html)
+
+def copy_tree(source_dir, target_dir, skip=()):
+    """Copy every other file as-is (with compressed siblings); returns the file count"""
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        relative_dir = os.path.relpath(dirpath, source_dir)
+        dirnames[:] = [d for d in dirnames if os.path.normpath(os.path.join(relative_dir, d)) not in skip]
+        for name in filenames:
+            relative = os.path.normpath(os.path.join(relative_dir, name))
+            if relative in skip:
+                continue
+            with open(os.path.join(dirpath, name), 'rb') as f:
+                data = f.read()
+            path = os.path.join(target_dir, relative)
+            write_file(path, data)
+            write_compressed(path, data)
+            count += 1
+    return count
+
+def main():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+
+    manifest = {}
+    saved = build_assets(manifest)
+
+    for page in HTML_PAGES:
+        with open(os.path.join(SOURCE_DIR, page), encoding='utf-8') as f:
+            html = rewrite_references(f.read(), manifest)
+        path = os.path.join(DIST_DIR, page)
+        write_file(path, html.encode('utf-8'))
+        write_compressed(path, html.encode('utf-8'))
+
+    copied = copy_tree(SOURCE_DIR, DIST_DIR, skip={'js', 'css', *HTML_PAGES})
+    modules = copy_tree(MODULES_DIR, os.path.join(DIST_DIR, 'modules'))
+
+    write_file(os.path.join(DIST_DIR, 'asset-manifest.json'),
+               json.dumps(manifest, indent=4, sort_keys=True).encode('utf-8'))
+
+    for original, hashed in sorted(manifest.items()):
+        print(f"  {original:<24} -> {hashed}")
+    print(f"Minified {len(manifest)} assets ({saved // 1024} KB saved), "
+          f"copied {copied} files and {modules} modules")
+    print(f"Precompressed with gzip{' and brotli' if brotli is not None else ''}")
+    print(f"Generated: {os.path.relpath(DIST_DIR, ROOT_DIR)}/")
+
+if __name__ == "__main__":
+    main()
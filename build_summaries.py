@@ -0,0 +1,49 @@
+"""
+Summaries Build Step
+Precomputes the /api/summarize output for every module of every subject
+
+Run it after regenerating content (content_updater_v4.py,
+generate_roadmaps_and_quizzes.py, ...):
+
+    python build_summaries.py
+
+It writes curriculum_summaries.json next to the curriculum files. The
+backend loads it at startup and serves those summaries as long as the
+module they were built from is unchanged; anything stale or missing is
+summarized on the fly.
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'backend'))
+
+import codec
+from app import CURRICULUM_FILES, SUMMARIES_PATH, build_snapshot, build_summary_artifact
+
+def main():
+    start = time.perf_counter()
+    snapshots = []
+    for subject in CURRICULUM_FILES:
+        snapshot = build_snapshot(subject)
+        if snapshot is None:
+            print(f"Skipping {subject}: curriculum could not be loaded")
+            continue
+        snapshots.append(snapshot)
+
+    artifact = build_summary_artifact(snapshots)
+
+    # Write to a temporary file first so a running backend never reads half a file
+    tmp_path = f"{SUMMARIES_PATH}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(codec.dumps(artifact))
+    os.replace(tmp_path, SUMMARIES_PATH)
+
+    elapsed = time.perf_counter() - start
+    for snapshot in snapshots:
+        print(f"  {snapshot.subject}: {len(snapshot.modules)} modules ({snapshot.content_hash[:12]})")
+    print(f"Generated: {os.path.relpath(SUMMARIES_PATH, ROOT_DIR)} in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
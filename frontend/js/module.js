@@ -21,12 +21,7 @@ async function initModule() {
 
     // 2. Load the FULL module JSON file
     try {
-        const modulePath = `../modules/${subject}/${level}/${moduleId}.json`;
-        const response = await fetch(modulePath);
-
-        if (!response.ok) throw new Error(`Failed to load module from ${modulePath}`);
-
-        const moduleData = await response.json();
+        const moduleData = await loadModuleData(subject, level, moduleId);
         currentModuleData = { ...moduleData, subject, level, module_id: moduleId };
 
         // 3. Render Module Content
@@ -40,6 +35,74 @@ async function initModule() {
     }
 }
 
+// Modules of the current level, kept for the rest of the session so moving
+// between modules of a level needs no request
+const LEVEL_BUNDLE_KEY = 'levelBundle';
+
+// Sections the page renders; quiz and ai_summary are fetched on demand
+// (see moduleState.loadSection)
+const PAGE_SECTIONS = ['module_header', 'definition', 'concept_overview', 'theory',
+    'mathematical_formulation', 'worked_examples', 'key_takeaways'];
+
+async function loadModuleData(subject, level, moduleId) {
+    const cached = sessionStorage.getItem(bundleKey(subject, level, moduleId));
+    if (cached) return JSON.parse(cached);
+
+    // One request for the whole level (served when the API is mounted, see
+    // serve_frontend.py --api)
+    try {
+        const response = await fetch(`/api/bundle/${subject}/${level}?sections=${PAGE_SECTIONS.join(',')}`);
+        if (response.ok) {
+            const bundle = storeBundle(new Uint8Array(await response.arrayBuffer()));
+            if (bundle.next) prefetchBundle(bundle.next);
+            const position = bundle.index.findIndex(entry => entry.module_id === moduleId);
+            if (position >= 0) return bundle.modules[position];
+        }
+    } catch (err) {
+        console.warn('Level bundle unavailable, loading the module file', err);
+    }
+
+    const modulePath = `../modules/${subject}/${level}/${moduleId}.json`;
+    const response = await fetch(modulePath);
+    if (!response.ok) throw new Error(`Failed to load module from ${modulePath}`);
+    return response.json();
+}
+
+function bundleKey(subject, level, moduleId) {
+    return `${LEVEL_BUNDLE_KEY}:${subject}/${level}/${moduleId}`;
+}
+
+// Store each module of a bundle as its own slice, located by the byte
+// offsets in the bundle's index
+function storeBundle(bytes) {
+    const decoder = new TextDecoder();
+    const bundle = JSON.parse(decoder.decode(bytes));
+    bundle.index.forEach(entry => {
+        const slice = bytes.subarray(entry.offset, entry.offset + entry.length);
+        try {
+            sessionStorage.setItem(bundleKey(bundle.subject, bundle.level, entry.module_id),
+                decoder.decode(slice));
+        } catch (err) {
+            // Storage full: later modules are fetched again
+        }
+    });
+    return bundle;
+}
+
+// Fetch the bundle that follows on the roadmap once the page is idle, so
+// moving on to the next level needs no request either
+function prefetchBundle(url) {
+    const whenIdle = window.requestIdleCallback || (callback => setTimeout(callback, 1000));
+    whenIdle(async () => {
+        try {
+            const response = await fetch(url);
+            if (response.ok) storeBundle(new Uint8Array(await response.arrayBuffer()));
+        } catch (err) {
+            // The next level is loaded when it is opened
+        }
+    });
+}
+
 function renderModule(data) {
     // Module Header
     const header = data.module_header;
@@ -154,7 +217,20 @@ window.moduleState = {
             level: currentModuleData.level,
             module_id: currentModuleData.module_id,
             module_name: currentModuleData.module_header?.module_title || 'Unknown',
-            data: currentModuleData  // Full module data for quiz/summary
+            data: currentModuleData  // Module data loaded so far
         };
+    },
+
+    // A section of the current module, fetched the first time it is needed
+    // unless the page already has it (e.g. loaded from the module file)
+    loadSection: async (key) => {
+        if (!currentModuleData) return null;
+        if (!(key in currentModuleData)) {
+            const { subject, level, module_id } = currentModuleData;
+            const response = await fetch(`/api/module/${subject}/${level}/${module_id}?sections=${key}`);
+            if (!response.ok) throw new Error(`Failed to load ${key}`);
+            Object.assign(currentModuleData, await response.json());
+        }
+        return currentModuleData[key];
     }
 };
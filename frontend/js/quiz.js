@@ -1,5 +1,5 @@
 // Quiz Logic - Works with NEW JSON schema
-// Reads quiz from module data directly (not separate quiz files)
+// Reads quiz from module data (fetched on demand, not separate quiz files)
 
 let currentQuiz = null;
 
@@ -26,17 +26,24 @@ async function loadQuiz() {
         return;
     }
 
+    // Show loading UI
+    const startBtn = document.getElementById('startQuizBtn');
+    startBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Loading...';
+
     // Get quiz from module data
-    const quizData = currentModule.data.quiz;
+    let quizData = null;
+    try {
+        quizData = await moduleState.loadSection('quiz');
+    } catch (err) {
+        console.error(err);
+    }
 
     if (!quizData || quizData.length === 0) {
+        startBtn.innerHTML = 'Start Interactive Quiz';
         alert("No quiz available for this module.");
         return;
     }
 
-    // Show loading UI
-    document.getElementById('startQuizBtn').innerHTML = '<i class="fas fa-spinner fa-spin"></i> Loading...';
-
     // Transform quiz format
     currentQuiz = {
         questions: quizData.map(q => ({
@@ -1,5 +1,5 @@
 // AI Module Summarization - Works with NEW JSON schema
-// Displays ai_summary from module data (no backend API needed)
+// Displays ai_summary from module data (fetched on demand with the API)
 
 document.addEventListener('DOMContentLoaded', () => {
     const summarizeBtn = document.getElementById('summarizeBtn');
@@ -26,13 +26,6 @@ async function handleSummarize() {
         return;
     }
 
-    const aiSummary = currentModule.data.ai_summary;
-
-    if (!aiSummary) {
-        alert('No AI summary available for this module.');
-        return;
-    }
-
     const startBtn = document.getElementById('summarizeBtn');
     const container = document.getElementById('summaryContainer');
 
@@ -40,6 +33,20 @@ async function handleSummarize() {
     startBtn.disabled = true;
     startBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Loading Summary...';
 
+    let aiSummary = null;
+    try {
+        aiSummary = await moduleState.loadSection('ai_summary');
+    } catch (err) {
+        console.error(err);
+    }
+
+    if (!aiSummary) {
+        startBtn.disabled = false;
+        startBtn.innerHTML = '<i class="fas fa-sparkles"></i> AI Summary';
+        alert('No AI summary available for this module.');
+        return;
+    }
+
     // Small delay for UX effect
     setTimeout(() => {
         displaySummary(aiSummary);
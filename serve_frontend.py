@@ -1,29 +1,727 @@
 """
 Simple Frontend Server
 Serves the frontend with proper headers to avoid CORS issues
+
+Requests are handled by a fixed pool of worker threads and connections are
+kept alive (HTTP/1.1), so a page and all of its assets load over a few
+connections and one slow client never blocks the others. Between requests
+an idle connection waits in a selector on the server thread, not in a
+worker, so hundreds of open browser connections need no more threads.
+
+Small files (HTML, JS, CSS, curriculum JSON) are kept in memory and served
+without touching the filesystem; a background thread drops entries whose
+file changed. Larger files (module JSON) go out with zero-copy sendfile.
+
+Responses carry strong ETags, conditional requests (If-None-Match,
+If-Modified-Since) get 304, and single byte ranges get 206.
+
+When dist/ exists (see build_frontend.py) it is served instead of
+frontend/: minified, content-hashed assets marked immutable, and the
+.br/.gz sibling of each file picked by Accept-Encoding.
+
+With --api the backend (backend/app.py) is mounted under /api/ in the same
+process, so the frontend and the API share one origin, one port and the
+same keep-alive connections; browsers then send no CORS preflights.
+Otherwise the API runs separately on port 5000 and CORS preflight results
+are cached by the browser for CORS_MAX_AGE seconds.
+
+    python serve_frontend.py
+    python serve_frontend.py --api
+    FRONTEND_PORT=8080 FRONTEND_WORKERS=128 python serve_frontend.py
 """
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import email.utils
+import hashlib
 import http.server
+import io
 import socketserver
 import os
+import queue
+import re
+import selectors
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+
+PORT = int(os.environ.get('FRONTEND_PORT', 8000))
+
+# Output of build_frontend.py, served in preference to the sources
+DIST_DIRECTORY = "dist"
+_HAS_DIST = os.path.isdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), DIST_DIRECTORY))
+DIRECTORY = os.environ.get('FRONTEND_DIR') or (DIST_DIRECTORY if _HAS_DIST else "frontend")
+
+# module.js fetches ../modules/{subject}/{level}/{id}.json, i.e. /modules/...
+MODULES_DIRECTORY = os.path.join(DIST_DIRECTORY, "modules") if DIRECTORY == DIST_DIRECTORY else "modules"
+MODULES_PREFIX = "/modules/"
+
+# Precompressed siblings written by build_frontend.py, in order of preference
+PRECOMPRESSED = [('br', '.br'), ('gzip', '.gz')]
+
+# name.<content hash>.ext: the content never changes under that name
+HASHED_ASSET_RE = re.compile(r'\.[0-9a-f]{10}\.(?:js|css)$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Worker threads, i.e. requests served at the same time
+WORKERS = int(os.environ.get('FRONTEND_WORKERS', 64))
+
+# Open connections (busy or idle); beyond that new ones wait in the backlog
+MAX_CONNECTIONS = int(os.environ.get('FRONTEND_MAX_CONNECTIONS', 1024))
+
+# Seconds an idle keep-alive connection is kept open, and a client may
+# stall in the middle of a request
+KEEP_ALIVE_TIMEOUT = float(os.environ.get('FRONTEND_KEEP_ALIVE', 5))
+
+# Files up to this size (bytes) are cached in memory, larger ones are sent
+# with sendfile; the whole cache holds at most ASSET_CACHE_BYTES
+ASSET_CACHE_MAX_FILE = int(os.environ.get('FRONTEND_CACHE_MAX_FILE', 16 * 1024))
+ASSET_CACHE_BYTES = int(os.environ.get('FRONTEND_CACHE_BYTES', 32 * 1024 * 1024))
+
+# Seconds between checks of cached files for changes
+ASSET_RECHECK_INTERVAL = float(os.environ.get('FRONTEND_RECHECK', 1.0))
+
+# A servable file. body holds its contents when cached, and is None for
+# files sent from disk. etag is strong: a content hash for cached files,
+# mtime (ns) and size for the others.
+StaticAsset = namedtuple('StaticAsset', ['path', 'size', 'mtime', 'content_type', 'last_modified',
+                                         'etag', 'body'])
+
+# Seconds browsers may cache a CORS preflight result
+CORS_MAX_AGE = int(os.environ.get('CORS_MAX_AGE', 86400))
 
-PORT = 8000
-DIRECTORY = "frontend"
+# Requests under this prefix go to the mounted API (see --api)
+API_PREFIX = "/api/"
+
+# WSGI application mounted by mount_api(), or None when serving files only
+API_APP = None
+
+# Largest request body (bytes) passed to the API
+MAX_REQUEST_BODY = int(os.environ.get('FRONTEND_MAX_REQUEST_BODY', 1024 * 1024))
+
+class RequestBodyError(Exception):
+    """A request body that can't be read; args are (status, message)"""
+
+# Headers the server writes itself (send_response adds Date and Server),
+# dropped from the application's response
+_SERVER_HEADERS = frozenset(['connection', 'keep-alive', 'transfer-encoding', 'upgrade',
+                             'content-length', 'date', 'server'])
+
+_RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+class AssetCache:
+    """In-memory cache of small static files, validated by size and mtime"""
+    
+    def __init__(self, max_file_size=ASSET_CACHE_MAX_FILE, max_bytes=ASSET_CACHE_BYTES):
+        self.max_file_size = max_file_size
+        self.max_bytes = max_bytes
+        self._assets = {}  # filesystem path -> StaticAsset
+        self._missing = set()  # precompressed variants known not to exist
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, path):
+        """Cached asset for a path, or None; never touches the filesystem"""
+        return self._assets.get(path)
+    
+    def lookup(self, path, content_type, remember_missing=False):
+        """
+        Cached asset for a path, loading it on a miss
+        
+        With remember_missing, a path that doesn't exist is not looked up
+        again until the next revalidation (used for optional .br/.gz variants).
+        """
+        asset = self._assets.get(path)
+        if asset is not None or (remember_missing and path in self._missing):
+            return asset
+        asset = self.load(path, content_type)
+        if asset is None and remember_missing:
+            self._missing.add(path)
+        return asset
+    
+    def load(self, path, content_type):
+        """
+        Stat a file and describe it, reading (and caching) it if it is small
+        
+        Returns:
+            StaticAsset, or None if path is not a regular file
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        if stat.st_size > self.max_file_size:
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            return StaticAsset(path, stat.st_size, stat.st_mtime, content_type, last_modified, etag, None)
+        
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        asset = StaticAsset(path, len(body), stat.st_mtime, content_type, last_modified, etag, body)
+        
+        with self._lock:
+            old = self._assets.get(path)
+            added = asset.size - (old.size if old is not None else 0)
+            if self._bytes + added <= self.max_bytes:
+                self._assets[path] = asset
+                self._bytes += added
+        return asset
+    
+    def revalidate(self):
+        """Drop every entry whose file changed or disappeared"""
+        self._missing = set()
+        for path, asset in list(self._assets.items()):
+            try:
+                stat = os.stat(path)
+                unchanged = (stat.st_size, stat.st_mtime) == (asset.size, asset.mtime)
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                with self._lock:
+                    if self._assets.get(path) is asset:
+                        del self._assets[path]
+                        self._bytes -= asset.size
+    
+    def start_watcher(self, interval=ASSET_RECHECK_INTERVAL):
+        """Start a daemon thread that revalidates the cache every interval seconds"""
+        def watch():
+            while True:
+                time.sleep(interval)
+                self.revalidate()
+        
+        watcher = threading.Thread(target=watch, name='asset-watcher', daemon=True)
+        watcher.start()
+        return watcher
+
+ASSET_CACHE = AssetCache()
+
+class ThreadPoolHTTPServer(socketserver.TCPServer):
+    """
+    TCPServer that serves requests on a bounded pool of worker threads
+    
+    A worker serves the requests a connection has sent, then hands the
+    connection back (see MyHTTPRequestHandler.handle). The server thread
+    waits on idle connections with a selector and gives one to the pool
+    again only when its next request arrives, closing it after
+    KEEP_ALIVE_TIMEOUT otherwise. New connections are only accepted while a
+    worker is free and fewer than max_connections are open.
+    """
+    
+    allow_reuse_address = True
+    request_queue_size = 1024  # Connections not accepted yet queue in the kernel
+    
+    def __init__(self, server_address, handler_class, workers=WORKERS,
+                 max_connections=MAX_CONNECTIONS):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.max_connections = max_connections
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='frontend')
+        # Owned by the server thread
+        self._busy = 0  # Connections handed to the pool
+        self._idle = OrderedDict()  # socket -> (handler, deadline), oldest first
+        # Workers report finished connections here (the handler if it stays open)
+        self._returned = queue.SimpleQueue()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_send.setblocking(False)
+        self._running = False
+        self._stopped = threading.Event()
+    
+    def serve_forever(self, poll_interval=0.5):
+        self._running = True
+        self._stopped.clear()
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self._wakeup_recv, selectors.EVENT_READ)
+                listening = False
+                while self._running:
+                    accepting = (self._busy < self.workers
+                                 and self._busy + len(self._idle) < self.max_connections)
+                    if accepting != listening:
+                        if accepting:
+                            selector.register(self.socket, selectors.EVENT_READ)
+                        else:
+                            selector.unregister(self.socket)
+                        listening = accepting
+                    
+                    timeout = poll_interval
+                    if self._idle:
+                        deadline = next(iter(self._idle.values()))[1]
+                        timeout = max(0, min(timeout, deadline - time.monotonic()))
+                    
+                    for key, _ in selector.select(timeout):
+                        if key.fileobj is self.socket:
+                            self._handle_request_noblock()
+                        elif key.fileobj is self._wakeup_recv:
+                            self._wakeup_recv.recv(4096)
+                        else:
+                            # The next request of an idle connection arrived
+                            selector.unregister(key.fileobj)
+                            handler, _ = self._idle.pop(key.fileobj)
+                            self._busy += 1
+                            self._pool.submit(self._resume, handler)
+                    
+                    self._collect_returned(selector)
+                    self._expire_idle(selector)
+        finally:
+            self._stopped.set()
+    
+    def shutdown(self):
+        self._running = False
+        self._wake()
+        self._stopped.wait()
+    
+    def process_request(self, request, client_address):
+        self._busy += 1
+        self._pool.submit(self._serve, request, client_address)
+    
+    def _serve(self, request, client_address):
+        handler = None
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+        self._finished(request, handler)
+    
+    def _resume(self, handler):
+        try:
+            handler.resume()
+        except Exception:
+            handler.parked = False
+            self.handle_error(handler.request, handler.client_address)
+        self._finished(handler.request, handler)
+    
+    def _finished(self, request, handler):
+        """Worker side: close the connection, or return it to the server thread"""
+        if handler is not None and handler.parked:
+            self._returned.put(handler)
+        else:
+            self.shutdown_request(request)
+            self._returned.put(None)
+        self._wake()
+    
+    def _wake(self):
+        try:
+            self._wakeup_send.send(b'\0')
+        except BlockingIOError:
+            pass  # A wakeup is already pending
+    
+    def _collect_returned(self, selector):
+        while True:
+            try:
+                handler = self._returned.get_nowait()
+            except queue.Empty:
+                return
+            self._busy -= 1
+            if handler is not None:
+                selector.register(handler.connection, selectors.EVENT_READ)
+                self._idle[handler.connection] = (handler, time.monotonic() + KEEP_ALIVE_TIMEOUT)
+    
+    def _expire_idle(self, selector):
+        now = time.monotonic()
+        while self._idle:
+            connection, (handler, deadline) = next(iter(self._idle.items()))
+            if deadline > now:
+                return
+            del self._idle[connection]
+            selector.unregister(connection)
+            self._close_idle(handler)
+    
+    def _close_idle(self, handler):
+        handler.parked = False
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+    
+    def server_close(self):
+        super().server_close()
+        for handler, _ in list(self._idle.values()):
+            self._close_idle(handler)
+        self._idle.clear()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+def mount_api():
+    """
+    Import the backend, load its content and mount it under API_PREFIX
+    
+    Returns:
+        List of subjects whose curriculum couldn't be loaded
+    """
+    global API_APP
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+    import app as backend
+    
+    missing = backend.preload_curricula()
+    backend.start_curriculum_watcher()
+    API_APP = backend.app
+    return missing
 
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Persistent connections
+    timeout = KEEP_ALIVE_TIMEOUT  # For a request in progress; idle waits are the server's
+    
     def __init__(self, *args, **kwargs):
+        self._api_response = False
+        self.parked = False
         super().__init__(*args, directory=DIRECTORY, **kwargs)
     
+    def handle(self):
+        """
+        Serve the requests received so far
+        
+        When the connection stays open but the next request hasn't arrived,
+        it is parked: left open and handed back to ThreadPoolHTTPServer,
+        which calls resume() once more data comes in.
+        """
+        self.parked = False
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self.request_pending():
+                self.parked = True
+                return
+            self.handle_one_request()
+    
+    def resume(self):
+        """Continue a parked connection whose next request has arrived"""
+        try:
+            self.handle()
+        finally:
+            self.finish()
+    
+    def finish(self):
+        if not self.parked:
+            super().finish()
+    
+    def request_pending(self):
+        """Whether bytes of another request are already buffered or readable, without waiting"""
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+    
+    def is_api_request(self):
+        path = self.path.split('?', 1)[0]
+        return API_APP is not None and (path == API_PREFIX.rstrip('/') or path.startswith(API_PREFIX))
+    
+    def translate_path(self, path):
+        # Module documents live next to frontend/, not inside it
+        if path.startswith(MODULES_PREFIX):
+            relative = os.path.relpath(super().translate_path(path[len(MODULES_PREFIX) - 1:]),
+                                       self.directory)
+            return os.path.join(MODULES_DIRECTORY, relative)
+        return super().translate_path(path)
+    
+    def do_GET(self):
+        if self.is_api_request():
+            self.send_api_response()
+        elif not self.send_asset():
+            super().do_GET()
+    
+    def do_HEAD(self):
+        if self.is_api_request():
+            self.send_api_response()
+        elif not self.send_asset(head=True):
+            super().do_HEAD()
+    
+    def do_POST(self):
+        if self.is_api_request():
+            self.send_api_response()
+        else:
+            # The body is never read, so it can't be told apart from a next request
+            self.close_connection = True
+            self.send_error(405)
+    
+    def do_OPTIONS(self):
+        if self.is_api_request():
+            self.send_api_response()
+            return
+        # Preflight for the static files
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def send_api_response(self):
+        """Run the request through the mounted WSGI application"""
+        path, _, query = self.path.partition('?')
+        try:
+            body = self.read_body()
+        except RequestBodyError as e:
+            # Where the body ends is unknown, so the connection can't be reused
+            self.close_connection = True
+            self.send_error(*e.args)
+            return
+        
+        environ = {
+            'REQUEST_METHOD': self.command,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': urllib.parse.unquote_to_bytes(path).decode('latin-1'),
+            'QUERY_STRING': query,
+            'SERVER_NAME': self.server.server_address[0] or 'localhost',
+            'SERVER_PORT': str(self.server.server_address[1]),
+            'SERVER_PROTOCOL': self.request_version,
+            'REMOTE_ADDR': self.client_address[0],
+            'CONTENT_LENGTH': str(len(body)) if body else '',
+            'CONTENT_TYPE': self.headers.get('Content-Type', ''),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in self.headers.items():
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            # The body is passed decoded, with its length
+            if key not in ('HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH', 'HTTP_TRANSFER_ENCODING'):
+                environ[key] = f'{environ[key]},{value}' if key in environ else value
+        
+        started = []
+        def start_response(status, headers, exc_info=None):
+            started[:] = [status, headers]
+        
+        result = API_APP(environ, start_response)
+        try:
+            # API responses are small JSON documents; buffering them gives a
+            # Content-Length, which keeps the connection alive
+            data = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        
+        status, headers = started
+        code, _, reason = status.partition(' ')
+        # HEAD responses keep the application's Content-Length of the GET body
+        content_length = next((value for name, value in headers if name.lower() == 'content-length'
+                               and self.command == 'HEAD'), str(len(data)))
+        self._api_response = True
+        try:
+            self.send_response(int(code), reason)
+            for name, value in headers:
+                if name.lower() not in _SERVER_HEADERS:
+                    self.send_header(name, value)
+            self.send_header('Content-Length', content_length)
+            self.end_headers()
+        finally:
+            self._api_response = False
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+    
+    def send_asset(self, head=False):
+        """
+        Serve a regular file from the asset cache or with sendfile
+        
+        Returns:
+            False if the path is not a regular file (directories, 404s),
+            which are left to SimpleHTTPRequestHandler
+        """
+        path = self.translate_path(self.path)
+        if path.endswith('/'):
+            return False
+        content_type = self.guess_type(path)
+        
+        encoding, asset = None, None
+        accepted = self.accepted_encodings()
+        for name, suffix in PRECOMPRESSED:
+            if name in accepted:
+                asset = ASSET_CACHE.lookup(path + suffix, content_type, remember_missing=True)
+                if asset is not None:
+                    encoding = name
+                    break
+        if asset is None:
+            asset = ASSET_CACHE.lookup(path, content_type)
+            if asset is None:
+                return False
+        
+        cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_ASSET_RE.search(path) else 'no-cache'
+        if self.not_modified(asset):
+            self.send_response(304)
+            self.send_header('ETag', asset.etag)
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return True
+        
+        byte_range = self.requested_range(asset)
+        if byte_range == 'unsatisfiable':
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{asset.size}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return True
+        start, end = byte_range or (0, asset.size)
+        
+        if byte_range:
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{asset.size}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(end - start))
+        self.send_header('Last-Modified', asset.last_modified)
+        self.send_header('ETag', asset.etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding is not None:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if head or start == end:
+            return True
+        
+        if asset.body is not None:
+            self.wfile.write(asset.body[start:end])
+        else:
+            with open(asset.path, 'rb') as f:
+                self.connection.sendfile(f, start, end - start)
+        return True
+    
+    def read_body(self):
+        """
+        Request body, framed by Content-Length or chunked Transfer-Encoding
+        
+        Raises:
+            RequestBodyError: The framing is invalid or the body too large
+        """
+        transfer_encoding = self.headers.get('Transfer-Encoding')
+        if transfer_encoding is not None:
+            if transfer_encoding.strip().lower() != 'chunked':
+                raise RequestBodyError(501, 'Unsupported Transfer-Encoding')
+            return self.read_chunked_body()
+        
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            raise RequestBodyError(400, 'Invalid Content-Length') from None
+        if length < 0:
+            raise RequestBodyError(400, 'Invalid Content-Length')
+        if length > MAX_REQUEST_BODY:
+            raise RequestBodyError(413, 'Request body too large')
+        body = self.rfile.read(length) if length else b''
+        if len(body) < length:
+            raise RequestBodyError(400, 'Incomplete request body')
+        return body
+    
+    def read_chunked_body(self):
+        chunks, size = [], 0
+        while True:
+            line = self.rfile.readline(1024)
+            try:
+                chunk_size = int(line.split(b';', 1)[0].strip(), 16)
+            except ValueError:
+                raise RequestBodyError(400, 'Invalid chunk size') from None
+            if chunk_size < 0:
+                raise RequestBodyError(400, 'Invalid chunk size')
+            if chunk_size == 0:
+                break
+            size += chunk_size
+            if size > MAX_REQUEST_BODY:
+                raise RequestBodyError(413, 'Request body too large')
+            chunk = self.rfile.read(chunk_size)
+            if len(chunk) < chunk_size or self.rfile.readline(1024).strip():
+                raise RequestBodyError(400, 'Invalid chunk')
+            chunks.append(chunk)
+        # Trailer fields, up to the empty line
+        while True:
+            line = self.rfile.readline(65537)
+            if not line:
+                raise RequestBodyError(400, 'Incomplete request body')
+            if line in (b'\r\n', b'\n'):
+                return b''.join(chunks)
+    
+    def requested_range(self, asset):
+        """
+        Byte range asked for with Range (and still valid per If-Range)
+        
+        Only single ranges are served; anything else gets the full body.
+        
+        Returns:
+            (start, end) with end exclusive, None for the full body, or
+            'unsatisfiable'
+        """
+        header = self.headers.get('Range')
+        if not header or self.command != 'GET':
+            return None
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() not in (asset.etag, asset.last_modified):
+            return None
+        
+        match = _RANGE_RE.match(header.strip())
+        if not match or match.groups() == ('', ''):
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, asset.size) if last else asset.size
+            if last and int(last) < start:
+                return None
+        else:
+            start, end = max(asset.size - int(last), 0), asset.size
+        if start >= asset.size or start >= end:
+            return 'unsatisfiable'
+        return start, end
+    
+    def accepted_encodings(self):
+        """Content codings the client accepts (q=0 excluded)"""
+        accepted = set()
+        for item in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = item.partition(';')
+            quality = params.strip().lower()
+            if name.strip() and quality not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                accepted.add(name.strip().lower())
+        return accepted
+    
+    def not_modified(self, asset):
+        """Whether If-None-Match (or else If-Modified-Since) shows the client's copy is current"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            # Weak comparison: a W/ prefix doesn't matter here
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return '*' in tags or asset.etag in tags
+        if 'If-Modified-Since' not in self.headers:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        return int(asset.mtime) <= since.timestamp()
+    
     def end_headers(self):
-        # Add CORS headers
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        # Add CORS headers (the API sends its own)
+        if not self._api_response:
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Access-Control-Max-Age', str(CORS_MAX_AGE))
         super().end_headers()
 
 if __name__ == '__main__':
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
+    ASSET_CACHE.start_watcher()
+    
+    with_api = '--api' in sys.argv[1:]
+    if with_api:
+        missing = mount_api()
+        if missing:
+            print(f"WARNING: curricula not loaded: {', '.join(missing)}")
+    
+    with ThreadPoolHTTPServer(("", PORT), MyHTTPRequestHandler) as httpd:
         print("=" * 60)
         print(f"Frontend Server Running!")
         print("=" * 60)
@@ -31,7 +729,13 @@ if __name__ == '__main__':
         print(f"\n   http://localhost:{PORT}/module.html")
         print(f"\n")
         print("✓ This server serves the frontend without CORS issues")
-        print("✓ Make sure the backend is also running on port 5000")
+        print(f"✓ Serving {DIRECTORY}/" + ("" if _HAS_DIST else " (run build_frontend.py for minified, precompressed assets)"))
+        print(f"✓ {httpd.workers} worker threads, HTTP/1.1 keep-alive (idle connections hold no thread)")
+        print(f"✓ Files up to {ASSET_CACHE_MAX_FILE // 1024} KB served from memory, larger ones with sendfile")
+        if with_api:
+            print(f"✓ API mounted at http://localhost:{PORT}{API_PREFIX} (same origin, no CORS preflights)")
+        else:
+            print("✓ Make sure the backend is also running on port 5000 (or use --api)")
         print("\nPress Ctrl+C to stop")
         print("=" * 60)
         httpd.serve_forever()